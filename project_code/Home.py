@@ -1,5 +1,4 @@
 import streamlit as st
-import os
 from ui_components import HomePageUI
 
 st.set_page_config(
@@ -18,20 +17,18 @@ HomePageUI.render_hero_section()
 
 st.markdown("### Available AI Assistants:")
 
-# Explicitly defined page configurations
-pages = [
-    {"icon": "💬", "title": "Basic AI Chat", "description": "Simple AI conversation", "file": "pages/1_basic.py"},
-    {"icon": "🔍", "title": "Search Enabled Chat", "description": "AI with internet search capabilities", "file": "pages/2_chatbot_agent.py"},
-    {"icon": "📚", "title": "RAG", "description": "Retrieval-Augmented Generation with documents", "file": "pages/3_chat_with_your_data.py"},
-    {"icon": "🔧", "title": "MCP Chatbot", "description": "Model Context Protocol integration", "file": "pages/4_mcp_agent.py"},
-]
-
-# Enhanced feature list using centralized components
-st.markdown("""
-<div class="feature-list">
-    <h3 style="color: #00d4aa; margin-bottom: 1.5rem; text-align: center;">✨ Available Features</h3>
-</div>
-""", unsafe_allow_html=True)
-
-for page_info in pages:
-    HomePageUI.render_feature_card(page_info["icon"], page_info["title"], page_info["description"])
+# Static page registry: (icon, title, description, file) for each assistant page
+PAGES = (
+    ("💬", "Basic AI Chat", "Simple AI conversation", "pages/1_Basic_Chatbot.py"),
+    ("🔍", "Search Enabled Chat", "AI with internet search capabilities", "pages/2_Chatbot_Agent.py"),
+    ("📚", "RAG", "Retrieval-Augmented Generation with documents", "pages/3_Chat_with_your_Data.py"),
+    ("🔧", "MCP Chatbot", "Model Context Protocol integration", "pages/4_MCP_Agent.py"),
+)
+
+# Feature list header and cards rendered as a single element
+HomePageUI.render_feature_list(tuple((icon, title, description) for icon, title, description, _ in PAGES))
+
+# Client-side links to each page; navigating doesn't rerun this script
+for column, (icon, title, _, page_file) in zip(st.columns(len(PAGES)), PAGES):
+    with column:
+        st.page_link(page_file, label=title, icon=icon, use_container_width=True)
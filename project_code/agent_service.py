@@ -5,8 +5,7 @@ This module provides an MCPAgent class that integrates with Model Context Protoc
 """
 
 import asyncio
-import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional
 
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
@@ -39,17 +38,13 @@ class MCPAgent:
         """Initialize the agent with MCP client and tools.
         
         This method:
-        1. Sets up the OpenAI API key in environment
-        2. Creates MCP client connection to the server
-        3. Retrieves available tools from MCP servers
-        4. Initializes LLM and creates ReAct agent
+        1. Creates MCP client connection to the server
+        2. Retrieves available tools from MCP servers
+        3. Initializes LLM with this agent's API key and creates ReAct agent
         
         Raises:
             Exception: If MCP client connection or tool retrieval fails
         """
-        # Configure OpenAI API access
-        os.environ["OPENAI_API_KEY"] = self.openai_api_key
-        
         # Configure MCP client with server connection
         mcp_config = {
             "theme": {
@@ -65,7 +60,8 @@ class MCPAgent:
         # Initialize language model with optimal settings for agent use
         llm = ChatOpenAI(
             model="gpt-4o", 
-            temperature=0  # Use deterministic responses for consistency
+            temperature=0,  # Use deterministic responses for consistency
+            api_key=self.openai_api_key
         )
         
         # Create ReAct (Reasoning + Acting) agent with tools
@@ -98,15 +94,37 @@ class MCPAgent:
             # Return user-friendly error message
             return f"❌ Error with AI agent: {str(e)}"
 
-# Global agent instance for singleton pattern
-_global_agent: Optional[MCPAgent] = None
-
+    async def astream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """Stream the agent's reply to user messages token by token.
+        
+        Only text generated by the agent's LLM node is yielded; tool calls
+        and tool results are consumed silently.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+            
+        Yields:
+            Response text chunks as the model produces them
+        """
+        # Ensure agent is initialized before processing
+        if not self.agent:
+            await self.initialize()
+            
+        try:
+            async for chunk, metadata in self.agent.astream({"messages": messages}, stream_mode="messages"):
+                if metadata.get("langgraph_node") == "agent" and isinstance(chunk.content, str) and chunk.content:
+                    yield chunk.content
+                    
+        except Exception as e:
+            # Surface a user-friendly error message in the stream
+            yield f"❌ Error with AI agent: {str(e)}"
 
 async def get_agent(openai_api_key: str, server_url: str) -> MCPAgent:
-    """Get or create a singleton agent instance.
+    """Create and initialize an agent for an API key and server URL.
     
-    This function implements a singleton pattern to ensure only one agent
-    instance exists throughout the application lifecycle.
+    The module keeps no global agent state; callers that want to reuse an
+    agent across requests cache the returned instance themselves (the MCP
+    page keeps one per key and URL in st.cache_resource).
     
     Args:
         openai_api_key: OpenAI API key for the agent
@@ -114,15 +132,7 @@ async def get_agent(openai_api_key: str, server_url: str) -> MCPAgent:
         
     Returns:
         Initialized MCPAgent instance
-        
-    Note:
-        The agent will be created and initialized on first call.
-        Subsequent calls return the existing instance.
     """
-    global _global_agent
-    
-    if _global_agent is None:
-        _global_agent = MCPAgent(openai_api_key, server_url)
-        await _global_agent.initialize()
-        
-    return _global_agent
\ No newline at end of file
+    agent = MCPAgent(openai_api_key, server_url)
+    await agent.initialize()
+    return agent
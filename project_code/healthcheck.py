@@ -154,7 +154,9 @@ def test_basic_chatbot_import():
     print_status("Testing Basic Chatbot import...")
     
     try:
-        sys.path.append('.')
+        # Make project modules importable without growing sys.path on repeat calls
+        if '.' not in sys.path:
+            sys.path.append('.')
         spec = importlib.util.spec_from_file_location("basic_chatbot", "pages/1_Basic_Chatbot.py")
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
@@ -5,20 +5,248 @@ Provides helper classes for different types of chatbot functionality:
 - BasicChatbotHelper: Simple conversational AI
 - AgentChatbotHelper: AI with web search capabilities  
 - RAGHelper: Retrieval-Augmented Generation for documents
+- SemanticAnswerCache: Similarity cache for answered RAG questions
 - MCPHelper: Model Context Protocol integration
 - ValidationHelper: Input validation utilities
 """
 
+import asyncio
+import hashlib
+import importlib.util
 import os
-from typing import List, Dict, Any, TypedDict, Literal
+import pickle
+import queue
+import re
+import shutil
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import urlsplit
+from typing import TYPE_CHECKING, List, Dict, Any, AsyncIterator, Callable, Iterable, Iterator, Optional, Tuple, TypedDict, Literal
+
+import httpx
+import numpy as np
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
 from langchain_openai import ChatOpenAI
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig
 from langchain_core.documents import Document
-from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langgraph.graph import StateGraph, END
+
+# FAISS, the PDF loader, the text splitter and LangGraph are only needed by
+# the RAG page; they are imported where used so the other pages start faster
+if TYPE_CHECKING:
+    import faiss
+    from langchain_community.vectorstores import FAISS
+
+
+# Accepted MCP server URL schemes
+_URL_SCHEMES = frozenset({"http", "https"})
+
+# Chat history roles mapped to ChatPromptTemplate message types
+_HISTORY_ROLES = {"user": "human", "assistant": "assistant"}
+
+# Text splitter settings; also part of the pickled chunk file names
+_CHUNK_SIZE = 1500
+_CHUNK_OVERLAP = 200
+
+
+@lru_cache(maxsize=1)
+def _text_splitter() -> Any:
+    """Shared text splitter; separators are compiled once instead of per upload."""
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    
+    return RecursiveCharacterTextSplitter(
+        chunk_size=_CHUNK_SIZE,
+        chunk_overlap=_CHUNK_OVERLAP,
+        length_function=len,
+        add_start_index=False
+    )
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write a file through a private temporary sibling and swap it in.
+    
+    Readers never see a partial file, and concurrent writers of the same
+    path each replace it whole.
+    """
+    temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _load_cached_pickle(path: str) -> Any:
+    """Load a cache pickle, or return None when it is missing or unreadable.
+    
+    A hit refreshes the file's modification time, so RAGHelper.prune_cache
+    evicts the least recently used entries first.
+    """
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # A truncated or incompatible file is a cache miss; it is rebuilt and replaced
+        return None
+    return value
+
+
+# Query classification hints; both sets compile into one alternation with a
+# named group per category that matches at word starts, so plurals and
+# inflections ("bullets", "exactly") still count and the question is
+# scanned in a single pass
+_SUMMARY_HINTS = frozenset({"summarize", "summary", "overview", "key points", "bullet", "synthesize"})
+_FACT_HINTS = frozenset({"when", "date", "who", "where", "amount", "total", "price", "figure", "specific", "exact"})
+
+
+def _hint_alternation(hints: frozenset) -> str:
+    """Join hint phrases into a regex alternation, longest first."""
+    return "|".join(re.escape(hint) for hint in sorted(hints, key=len, reverse=True))
+
+
+_HINTS_RE = re.compile(
+    rf"\b(?:(?P<fact>{_hint_alternation(_FACT_HINTS)})|(?P<summary>{_hint_alternation(_SUMMARY_HINTS)}))",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=1)
+def _shared_http_client() -> httpx.Client:
+    """HTTP client shared by every ChatOpenAI instance in the process.
+    
+    One keep-alive pool serves all chat models, so a model built for new
+    settings or another key reuses warm connections. HTTP/2 is enabled
+    when the optional h2 package is installed.
+    """
+    return DefaultHttpxClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+    )
+
+
+@lru_cache(maxsize=1)
+def _shared_async_http_client() -> httpx.AsyncClient:
+    """Async counterpart of _shared_http_client for models awaited via run_async.
+    
+    An async pool is bound to the event loop it first runs on, so models
+    given this client must only be awaited on the shared background loop.
+    """
+    return DefaultAsyncHttpxClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+    )
+
+
+@lru_cache(maxsize=1)
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Event loop that runs async client calls for the whole process.
+    
+    Async HTTP pools are bound to the loop they were first used on, so
+    cached clients must always be awaited on this same loop rather than
+    on a fresh one from asyncio.run.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="langchain-helpers-loop", daemon=True).start()
+    return loop
+
+
+def run_async(coro: Any) -> Any:
+    """Run a coroutine on the shared background loop and wait for its result.
+    
+    Args:
+        coro: Coroutine to execute
+        
+    Returns:
+        The coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+def iterate_async(async_iterator: AsyncIterator[Any]) -> Iterator[Any]:
+    """Consume an async iterator on the shared background loop as a plain iterator.
+    
+    Items are handed over through a queue as soon as they are produced, so
+    callers such as st.write_stream can render them incrementally. If the
+    consumer stops early (stop button, error, rerun), the producer is
+    cancelled instead of running on in the background.
+    
+    Args:
+        async_iterator: Async iterator to drain on the background loop
+        
+    Yields:
+        Items produced by the async iterator, in order
+    """
+    items: queue.Queue = queue.Queue()
+    done = object()
+    
+    async def pump() -> None:
+        try:
+            async for item in async_iterator:
+                items.put(item)
+        finally:
+            items.put(done)
+    
+    future = asyncio.run_coroutine_threadsafe(pump(), _background_loop())
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                break
+            yield item
+        
+        # Re-raise any error from the producer
+        future.result()
+    finally:
+        # No effect once the producer has finished
+        future.cancel()
+
+
+# Completions allowed in flight at once across every session and workflow
+_GENERATION_SLOTS = threading.BoundedSemaphore(4)
+
+# RAG generation prompts, shared by every compiled workflow
+_GEN_PROMPT_SUMMARY = ChatPromptTemplate.from_messages([
+    ("system",
+     "You are a helpful assistant. Create a concise, faithful summary ONLY using the provided context. "
+     "Prefer bullet points if helpful. Do not use outside knowledge."),
+    ("human",
+     "Question:\n{question}\n\n"
+     "Context (multiple document chunks):\n{context}\n\n"
+     "Write a grounded summary:")
+])
+
+_GEN_PROMPT_FACT = ChatPromptTemplate.from_messages([
+    ("system",
+     "You are a helpful assistant. Answer precisely and ONLY using the provided context. "
+     "If the context is insufficient, say so."),
+    ("human",
+     "Question:\n{question}\n\n"
+     "Context:\n{context}\n\n"
+     "Answer:")
+])
+
+# Rolling summary prompt for older chatbot turns
+_SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system",
+     "You maintain a running summary of a conversation between a user and an AI assistant. "
+     "Merge the new lines into the existing summary. Keep names, facts, decisions and open "
+     "questions; drop pleasantries. Reply with the updated summary only."),
+    ("human",
+     "Existing summary:\n{summary}\n\n"
+     "New lines:\n{transcript}")
+])
 
 
 class BasicChatbotHelper:
@@ -28,6 +256,25 @@ class BasicChatbotHelper:
     customizable response styles and conversation memory.
     """
     
+    # Estimated tokens of past conversation sent with each message; older
+    # turns are dropped so long chats keep a bounded prompt size
+    HISTORY_TOKEN_BUDGET = 3000
+    
+    # Recent messages always sent verbatim; older ones are folded into a
+    # rolling summary once another window's worth has accumulated
+    SUMMARY_WINDOW = 10
+    
+    DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant. Provide clear, concise, and friendly responses."
+    
+    # System prompts for the predefined response styles; "Balanced" uses the
+    # config's own system_prompt
+    RESPONSE_STYLE_PROMPTS = {
+        "Professional": "You are a professional AI assistant. Provide formal, detailed, and well-structured responses suitable for business contexts.",
+        "Casual": "You are a friendly and casual AI assistant. Use conversational language and be approachable in your responses.",
+        "Creative": "You are a creative AI assistant. Provide imaginative, engaging responses with varied perspectives and creative insights.",
+        "Technical": "You are a technical AI assistant. Provide precise, detailed explanations with technical accuracy and clarity.",
+    }
+    
     @staticmethod
     def build_chain(config: Dict[str, Any], api_key: str = None) -> Any:
         """Build a LangChain chain for basic chatbot functionality.
@@ -42,42 +289,91 @@ class BasicChatbotHelper:
         Returns:
             Configured LangChain chain ready for conversation
         """
+        llm = BasicChatbotHelper.get_llm(
+            config["model"],
+            config["temperature"],
+            config["max_tokens"],
+            config.get("top_p", 1.0),
+            config.get("frequency_penalty", 0.0),
+            config.get("presence_penalty", 0.0),
+            api_key
+        )
+        
+        # Configure response style with predefined system prompts
+        system_prompts = BasicChatbotHelper.RESPONSE_STYLE_PROMPTS
+        response_style = config.get("response_style", "Balanced")
+        if response_style in system_prompts:
+            system_message = system_prompts[response_style]
+        else:
+            system_message = config.get("system_prompt", BasicChatbotHelper.DEFAULT_SYSTEM_PROMPT)
+        
+        prompt = BasicChatbotHelper.get_prompt(system_message)
+        
+        return prompt | llm
+    
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def get_llm(model: str, temperature: float, max_tokens: int, top_p: float = 1.0,
+                frequency_penalty: float = 0.0, presence_penalty: float = 0.0,
+                api_key: str = None) -> ChatOpenAI:
+        """Get a shared chat model client for a set of generation settings.
+        
+        Chains rebuilt with the same settings reuse one client and its
+        HTTP connection pool.
+        
+        Args:
+            model: OpenAI chat model name
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens per response
+            top_p: Nucleus sampling probability mass
+            frequency_penalty: Penalty for frequent tokens
+            presence_penalty: Penalty for tokens already present
+            api_key: Optional OpenAI API key override
+            
+        Returns:
+            Cached ChatOpenAI instance
+        """
         llm_kwargs = {
-            "model": config["model"],
-            "temperature": config["temperature"],
-            "max_tokens": config["max_tokens"],
-            "top_p": config.get("top_p", 1.0),
-            "frequency_penalty": config.get("frequency_penalty", 0.0),
-            "presence_penalty": config.get("presence_penalty", 0.0),
-            "streaming": False
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": top_p,
+            "frequency_penalty": frequency_penalty,
+            "presence_penalty": presence_penalty,
+            "streaming": False,
+            "http_client": _shared_http_client()
         }
         
         if api_key:
             llm_kwargs["api_key"] = api_key
             
-        llm = ChatOpenAI(**llm_kwargs)
-        
-        # Configure response style with predefined system prompts
-        system_prompts = {
-            "Professional": "You are a professional AI assistant. Provide formal, detailed, and well-structured responses suitable for business contexts.",
-            "Casual": "You are a friendly and casual AI assistant. Use conversational language and be approachable in your responses.",
-            "Creative": "You are a creative AI assistant. Provide imaginative, engaging responses with varied perspectives and creative insights.",
-            "Technical": "You are a technical AI assistant. Provide precise, detailed explanations with technical accuracy and clarity.",
-            "Balanced": config.get("system_prompt", "You are a helpful AI assistant. Provide clear, concise, and friendly responses.")
-        }
+        return ChatOpenAI(**llm_kwargs)
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def get_prompt(system_message: str) -> ChatPromptTemplate:
+        """Get a shared chat prompt template for a system message.
         
-        system_message = system_prompts.get(config.get("response_style", "Balanced"), system_prompts["Balanced"])
+        Switching between response styles reuses the already parsed
+        templates instead of building new ones. The system prompt is a
+        prebuilt SystemMessage, so it is passed through unformatted on
+        every call (and braces in custom prompts are not read as variables).
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_message),
+        Args:
+            system_message: System prompt placed before the conversation
+            
+        Returns:
+            Cached ChatPromptTemplate with history and input placeholders
+        """
+        return ChatPromptTemplate.from_messages([
+            SystemMessage(content=system_message),
             ("placeholder", "{chat_history}"),
             ("human", "{input}"),
         ])
-        
-        return prompt | llm
     
     @staticmethod
-    def invoke_with_memory(chain: Any, user_input: str, chat_history: List[Dict[str, str]]) -> Any:
+    def invoke_with_memory(chain: Any, user_input: str, chat_history: List[Dict[str, str]],
+                           summary: str = "", start: int = 0) -> Any:
         """Invoke the chain with conversation memory support.
         
         Processes user input while maintaining context from previous messages
@@ -87,22 +383,167 @@ class BasicChatbotHelper:
             chain: The LangChain chain to invoke
             user_input: Current user message
             chat_history: List of previous conversation messages
+            summary: Optional summary of the messages before start
+            start: Index of the first message sent verbatim
             
         Returns:
             Chain response with conversation context
         """
-        # Convert chat history to LangChain message format
-        formatted_history = []
-        for msg in chat_history[:-1]:  # Exclude the current user message
-            if msg["role"] == "user":
-                formatted_history.append(("human", msg["content"]))
-            elif msg["role"] == "assistant":
-                formatted_history.append(("assistant", msg["content"]))
-        
         return chain.invoke({
             "input": user_input,
-            "chat_history": formatted_history
+            "chat_history": BasicChatbotHelper.memory_messages(chat_history, summary, start)
+        })
+    
+    @staticmethod
+    def stream_with_memory(chain: Any, user_input: str, chat_history: List[Dict[str, str]],
+                           summary: str = "", start: int = 0) -> Iterator[str]:
+        """Stream the chain's reply token by token with conversation memory.
+        
+        Args:
+            chain: The LangChain chain to invoke
+            user_input: Current user message
+            chat_history: List of previous conversation messages
+            summary: Optional summary of the messages before start
+            start: Index of the first message sent verbatim
+            
+        Yields:
+            Response text chunks as the model produces them
+        """
+        formatted_history = BasicChatbotHelper.memory_messages(chat_history, summary, start)
+        
+        for chunk in chain.stream({"input": user_input, "chat_history": formatted_history}):
+            if chunk.content:
+                yield chunk.content
+    
+    @staticmethod
+    def memory_messages(chat_history: List[Dict[str, str]], summary: str = "", start: int = 0) -> List[tuple]:
+        """Build the history sent with a new message.
+        
+        The current user message (last in chat_history) is excluded. Messages
+        before start are represented only by the summary, if one is given.
+        
+        Args:
+            chat_history: Conversation messages ending with the current one
+            summary: Optional summary of the messages before start
+            start: Index of the first message sent verbatim
+            
+        Returns:
+            List of (role, content) tuples understood by ChatPromptTemplate
+        """
+        # Exclude the current user message from the history without copying the list
+        formatted_history = BasicChatbotHelper.format_history(
+            islice(chat_history, start, max(start, len(chat_history) - 1)),
+            BasicChatbotHelper.HISTORY_TOKEN_BUDGET
+        )
+        if summary:
+            formatted_history.insert(0, ("system", f"Summary of the earlier conversation:\n{summary}"))
+        return formatted_history
+    
+    @staticmethod
+    def summary_due(chat_history: List[Dict[str, str]], start: int) -> bool:
+        """Check whether update_summary would fold any turns into the summary.
+        
+        Args:
+            chat_history: Full conversation messages
+            start: Index of the first message not yet summarized
+            
+        Returns:
+            True once SUMMARY_WINDOW messages have accumulated beyond the verbatim window
+        """
+        return len(chat_history) - start >= 2 * BasicChatbotHelper.SUMMARY_WINDOW
+    
+    @staticmethod
+    def update_summary(api_key: str, summary: str, chat_history: List[Dict[str, str]],
+                       start: int) -> Tuple[str, int]:
+        """Fold older turns into the rolling conversation summary.
+        
+        Once SUMMARY_WINDOW messages have accumulated beyond the verbatim
+        window, they are merged into the summary with one cheap model call,
+        so the summary is refreshed every few turns rather than every turn.
+        
+        Args:
+            api_key: OpenAI API key for the summarizing model
+            summary: Current summary of the messages before start
+            chat_history: Full conversation messages
+            start: Index of the first message not yet summarized
+            
+        Returns:
+            Tuple of the (possibly updated) summary and new start index
+        """
+        if not BasicChatbotHelper.summary_due(chat_history, start):
+            return summary, start
+        
+        end = len(chat_history) - BasicChatbotHelper.SUMMARY_WINDOW
+        transcript = "\n".join(
+            f"{msg['role']}: {msg['content']}" for msg in islice(chat_history, start, end)
+        )
+        llm = BasicChatbotHelper.get_llm("gpt-4o-mini", 0.0, 500, api_key=api_key)
+        response = (_SUMMARY_PROMPT | llm).invoke({
+            "summary": summary or "(none)",
+            "transcript": transcript
         })
+        return response.content, end
+    
+    @staticmethod
+    def invoke_batch(chain: Any, prompts: List[str], chat_history: List[Dict[str, str]] = None,
+                     max_concurrency: int = 8) -> List[str]:
+        """Answer several independent prompts with overlapping requests.
+        
+        Uses the chain's batch interface so the OpenAI calls run concurrently
+        instead of one after another. Useful for comparing alternatives or
+        answering a list of questions against the same conversation.
+        
+        Args:
+            chain: The LangChain chain to invoke
+            prompts: Independent user messages to answer
+            chat_history: Optional conversation shared by every prompt
+            max_concurrency: Maximum number of requests in flight at once
+            
+        Returns:
+            Response text for each prompt, in input order
+        """
+        formatted_history = BasicChatbotHelper.format_history(
+            chat_history or [], BasicChatbotHelper.HISTORY_TOKEN_BUDGET
+        )
+        responses = chain.batch(
+            [{"input": prompt, "chat_history": formatted_history} for prompt in prompts],
+            config={"max_concurrency": max_concurrency}
+        )
+        return [response.content for response in responses]
+    
+    @staticmethod
+    def format_history(chat_history: Iterable[Dict[str, str]],
+                       token_budget: Optional[int] = None) -> List[tuple]:
+        """Convert chat history to LangChain message format.
+        
+        Messages with roles other than user and assistant are skipped. With
+        a token budget, only the most recent messages that fit are kept,
+        estimating four characters per token.
+        
+        Args:
+            chat_history: Conversation messages with 'role' and 'content'
+            token_budget: Optional maximum estimated tokens of history to keep
+            
+        Returns:
+            List of (role, content) tuples understood by ChatPromptTemplate
+        """
+        formatted = [
+            (_HISTORY_ROLES[msg["role"]], msg["content"])
+            for msg in chat_history
+            if msg["role"] in _HISTORY_ROLES
+        ]
+        if token_budget is None:
+            return formatted
+        
+        # Walk back from the newest message until the budget is spent
+        start = len(formatted)
+        used = 0
+        while start > 0:
+            used += len(formatted[start - 1][1]) // 4 + 1
+            if used > token_budget:
+                break
+            start -= 1
+        return formatted[start:]
     
     @staticmethod
     def get_default_config() -> Dict[str, Any]:
@@ -151,7 +592,13 @@ class AgentChatbotHelper:
         
         tools = [tavily_search]
         
-        llm = ChatOpenAI(model="gpt-4o-mini", streaming=True, api_key=openai_api_key)
+        llm = ChatOpenAI(
+            model="gpt-4o-mini",
+            streaming=True,
+            api_key=openai_api_key,
+            http_client=_shared_http_client(),
+            http_async_client=_shared_async_http_client()
+        )
         agent = create_react_agent(llm, tools)
         return agent
     
@@ -159,8 +606,9 @@ class AgentChatbotHelper:
     async def process_agent_response(agent: Any, user_query: str) -> str:
         """Process agent response with streaming support.
         
-        Handles the agent's reasoning and tool usage steps, collecting
-        all output into a cohesive response.
+        Follows the agent's reasoning and tool usage steps and returns
+        the text of its final answer. Run it with run_async: the agent's
+        shared async HTTP pool lives on that loop.
         
         Args:
             agent: The configured LangGraph agent
@@ -169,35 +617,188 @@ class AgentChatbotHelper:
         Returns:
             Complete agent response as a string
         """
-        accumulated_response = ""
-        
-        # Stream state updates (includes reasoning and tool execution steps)
-        for update in agent.stream({"messages": user_query}):
-            messages = update.get("messages", [])
-            for message in messages:
-                content = getattr(message, "content", "")
-                
-                # Handle structured content (list of content blocks)
-                if not content and isinstance(getattr(message, "content", None), list):
-                    content = "".join(
-                        block.get("text", "")
-                        for block in message.content
-                        if isinstance(block, dict) and block.get("type") == "text"
-                    )
-                    
-                if content:
-                    accumulated_response += content
-
-        # Fallback to direct invocation if streaming failed
-        if not accumulated_response:
-            response = agent.invoke({"messages": user_query})
-            accumulated_response = (
-                response["messages"][-1].content
-                if isinstance(response, dict) and response.get("messages")
-                else str(response)
+        final_message = None
+        
+        # Stream node updates (reasoning and tool execution steps); the agent
+        # node's latest message is the answer once the tools are done. The
+        # async API keeps the event loop free and lets the tool node run
+        # parallel tool calls with asyncio.gather
+        async for update in agent.astream({"messages": user_query}, stream_mode="updates"):
+            agent_update = update.get("agent") or {}
+            messages = agent_update.get("messages", [])
+            if messages:
+                final_message = messages[-1]
+        
+        # Fallback to direct invocation if streaming produced no answer
+        if final_message is None:
+            response = await agent.ainvoke({"messages": user_query})
+            if not (isinstance(response, dict) and response.get("messages")):
+                return str(response)
+            final_message = response["messages"][-1]
+        
+        return AgentChatbotHelper.message_text(final_message.content)
+    
+    @staticmethod
+    def message_text(content: Any) -> str:
+        """Extract plain text from message content.
+        
+        Args:
+            content: Message content, either a string or a list of content blocks
+            
+        Returns:
+            The text of the message, joining the text blocks of structured content
+        """
+        if isinstance(content, list):
+            return "".join(
+                block.get("text", "")
+                for block in content
+                if isinstance(block, dict) and block.get("type") == "text"
             )
+        return content or ""
+
+
+class SemanticAnswerCache:
+    """Similarity cache for answered RAG questions.
+    
+    Stores normalized query embeddings next to their generated answers so
+    that repeated or paraphrased questions can skip the LLM call entirely.
+    One cache should be used per document set; for_path returns the one
+    live cache for a pickle file. With a path, the cache is loaded from
+    that file and saved to it shortly after answers are added, so answers
+    survive restarts.
+    """
+    
+    # Seconds between the first unsaved answer and the write, so bursts share one save
+    SAVE_DELAY = 5.0
+    
+    # Live caches by path, shared by every workflow over the same documents
+    _instances: "weakref.WeakValueDictionary[str, SemanticAnswerCache]" = weakref.WeakValueDictionary()
+    _instances_lock = threading.Lock()
+    
+    def __init__(self, threshold: float = 0.97, max_entries: int = 256, path: Optional[str] = None) -> None:
+        """Initialize the cache, loading saved answers when path exists.
+        
+        Args:
+            threshold: Default minimum cosine similarity for a cache hit
+            max_entries: Maximum cached answers before the oldest is evicted
+            path: Optional pickle file the cache is persisted to
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.path = path
+        self._index: Optional["faiss.IndexFlatIP"] = None
+        self._answers: List[str] = []
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        
+        if path:
+            self._load()
+    
+    @staticmethod
+    def for_path(path: str) -> "SemanticAnswerCache":
+        """Get the live cache persisted to path, creating it if needed.
+        
+        Separate instances for one file would each overwrite the other's
+        answers when saving, so they are shared while any workflow uses them.
+        
+        Args:
+            path: Pickle file the cache is persisted to
+            
+        Returns:
+            Cache shared by every caller with the same path
+        """
+        with SemanticAnswerCache._instances_lock:
+            cache = SemanticAnswerCache._instances.get(path)
+            if cache is None:
+                cache = SemanticAnswerCache(path=path)
+                SemanticAnswerCache._instances[path] = cache
+            return cache
+    
+    def _load(self) -> None:
+        """Restore the index and answers saved by _save; unreadable files start empty."""
+        import faiss
+        
+        saved = _load_cached_pickle(self.path)
+        if saved is not None:
+            self._index = faiss.deserialize_index(saved["index"])
+            self._answers = saved["answers"]
+    
+    def _schedule_save(self) -> None:
+        """Start a deferred save unless one is pending; the caller holds the lock."""
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self._save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _save(self) -> None:
+        """Write a snapshot of the index and answers to path.
+        
+        The snapshot is taken under the lock, but the file is written outside
+        it, so lookups and adds don't wait on disk I/O. Saves run one at a
+        time, so an older snapshot never replaces a newer one.
+        """
+        import faiss
         
-        return accumulated_response
+        with self._save_lock:
+            with self._lock:
+                self._save_timer = None
+                data = pickle.dumps(
+                    {"index": faiss.serialize_index(self._index), "answers": list(self._answers)},
+                    protocol=pickle.HIGHEST_PROTOCOL
+                )
+            _write_atomic(self.path, data)
+    
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        """Convert an embedding to a unit-length float32 row vector."""
+        import faiss
+        
+        array = np.asarray(vector, dtype="float32").reshape(1, -1)
+        faiss.normalize_L2(array)
+        return array
+    
+    def lookup(self, query_vector: List[float], threshold: Optional[float] = None) -> Optional[str]:
+        """Find a cached answer for a similar question.
+        
+        Args:
+            query_vector: Embedding of the incoming question
+            threshold: Optional similarity threshold overriding the default
+            
+        Returns:
+            Cached answer if a close enough question was seen, None otherwise
+        """
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return None
+            scores, ids = self._index.search(self._normalize(query_vector), 1)
+            if ids[0][0] >= 0 and scores[0][0] >= (self.threshold if threshold is None else threshold):
+                return self._answers[ids[0][0]]
+        return None
+    
+    def add(self, query_vector: List[float], answer: str) -> None:
+        """Store an answer for a question embedding.
+        
+        Args:
+            query_vector: Embedding of the answered question
+            answer: Generated answer to cache
+        """
+        import faiss
+        
+        with self._lock:
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(len(query_vector))
+            
+            # Evict the oldest entry; flat index ids shift down like the list
+            if self._index.ntotal >= self.max_entries:
+                self._index.remove_ids(np.array([0], dtype="int64"))
+                self._answers.pop(0)
+            
+            self._index.add(self._normalize(query_vector))
+            self._answers.append(answer)
+            
+            if self.path:
+                self._schedule_save()
 
 
 class RAGHelper:
@@ -207,205 +808,848 @@ class RAGHelper:
     capabilities for question-answering over user documents.
     """
     
+    # Reply used when the documents do not support an answer
+    FALLBACK_ANSWER = "I couldn't find enough information in the documents to answer that."
+    
+    # Texts per embeddings request and maximum requests in flight
+    EMBEDDING_BATCH_SIZE = 512
+    EMBEDDING_CONCURRENCY = 4
+    
+    # On-device embedding model used when RAG_EMBEDDINGS=local (384-d, int8 ONNX)
+    LOCAL_EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
+    
+    # Maximum characters of retrieved context sent to the LLM per mode
+    CONTEXT_CHAR_BUDGET = {"fact": 6000, "summary": 12000}
+    
+    # Chunk counts at which the vector index switches from exact flat search
+    # to HNSW, and from HNSW to IVF-PQ
+    HNSW_MIN_VECTORS = 5_000
+    IVFPQ_MIN_VECTORS = 100_000
+    
+    # Size cap for the on-disk caches kept under the upload folder
+    CACHE_MAX_BYTES = 2 * 1024 ** 3
+    
     # Type definition for RAG workflow state management
     class RAGState(TypedDict):
         question: str
         mode: Literal["summary", "fact"]
         documents: List[Document]
         generation: str
+        query_embedding: List[float]
     
     @staticmethod
-    def save_file(file, folder: str = "tmp") -> str:
-        """Save uploaded file to local storage.
+    def save_file(file_name: str, data: bytes, folder: str = "tmp") -> str:
+        """Save uploaded file contents to local storage under their content digest.
+        
+        Identical contents map to the same path, so a file that is already on
+        disk is not written again. New files are written atomically.
         
         Args:
-            file: Streamlit uploaded file object
+            file_name: Original name of the uploaded file (used for its extension)
+            data: Raw file contents
             folder: Directory to save the file (created if doesn't exist)
             
         Returns:
             Full path to the saved file
         """
         os.makedirs(folder, exist_ok=True)
-        file_path = os.path.join(folder, file.name)
-        with open(file_path, "wb") as f:
-            f.write(file.getvalue())
+        file_digest = hashlib.sha256(data).hexdigest()
+        extension = os.path.splitext(file_name)[1] or ".pdf"
+        file_path = os.path.join(folder, f"{file_digest}{extension}")
+        try:
+            # Mark the file as recently used; content-addressed, so it is already complete
+            os.utime(file_path)
+        except FileNotFoundError:
+            _write_atomic(file_path, data)
         return file_path
     
     @staticmethod
-    def build_vectorstore(files, api_key: str = None) -> FAISS:
+    def load_pages(file_path: str, source_name: str) -> List[Document]:
+        """Load the pages of a saved PDF, reusing a pickled parse when present.
+        
+        An unreadable pickle is treated as missing and the PDF is parsed again.
+        
+        Args:
+            file_path: Content-addressed path returned by save_file
+            source_name: Original file name recorded as the pages' source
+            
+        Returns:
+            One document per PDF page
+        """
+        pages_path = f"{os.path.splitext(file_path)[0]}.pkl"
+        pages = _load_cached_pickle(pages_path)
+        if pages is None:
+            from langchain_community.document_loaders import PyPDFLoader
+            
+            pages = PyPDFLoader(file_path).load()
+            _write_atomic(pages_path, pickle.dumps(pages, protocol=pickle.HIGHEST_PROTOCOL))
+        
+        # The pickle is shared by every upload of the same bytes, so the name is set per call
+        for page in pages:
+            page.metadata["source"] = source_name
+        return pages
+    
+    @staticmethod
+    def load_chunks(file_name: str, data: bytes, folder: str = "tmp") -> List[Document]:
+        """Save an uploaded PDF and split its pages into chunks.
+        
+        Args:
+            file_name: Original name of the uploaded file
+            data: Raw PDF contents
+            folder: Directory to save the file
+            
+        Returns:
+            Document chunks for the PDF
+        """
+        file_path = RAGHelper.save_file(file_name, data, folder)
+        return list(RAGHelper._split_pdf(file_path, file_name))
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _split_pdf(file_path: str, source_name: str) -> Tuple[Document, ...]:
+        """Split a saved PDF, memoized by its content-addressed path.
+        
+        Chunks are also pickled under a chunks/ folder next to the PDF, keyed
+        by content digest and splitter settings, so later runs skip both
+        parsing and splitting. An unreadable pickle is split again.
+        
+        Args:
+            file_path: Content-addressed path of the saved PDF
+            source_name: Original file name recorded as the chunks' source
+            
+        Returns:
+            Immutable tuple of document chunks
+        """
+        folder, base_name = os.path.split(file_path)
+        file_digest = os.path.splitext(base_name)[0]
+        chunks_dir = os.path.join(folder, "chunks")
+        chunks_path = os.path.join(chunks_dir, f"{file_digest}-{_CHUNK_SIZE}-{_CHUNK_OVERLAP}.pkl")
+        chunks = _load_cached_pickle(chunks_path)
+        if chunks is None:
+            chunks = tuple(_text_splitter().split_documents(RAGHelper.load_pages(file_path, source_name)))
+            os.makedirs(chunks_dir, exist_ok=True)
+            _write_atomic(chunks_path, pickle.dumps(chunks, protocol=pickle.HIGHEST_PROTOCOL))
+        
+        # Like the page pickle, the chunk pickle is shared across file names
+        for chunk in chunks:
+            chunk.metadata["source"] = source_name
+        return chunks
+    
+    @staticmethod
+    def prune_cache(folder: str = "tmp", max_bytes: Optional[int] = None) -> None:
+        """Evict the least recently used cache entries above a size cap.
+        
+        Uploaded files, parsed pages, chunk pickles, cached embedding vectors,
+        answer caches and saved indexes all live under folder. Each file, and
+        each saved index directory as a whole, is one entry. Cache hits
+        refresh an entry's modification time, so the oldest entries go first.
+        Temporary files of writes in progress are never removed.
+        
+        Args:
+            folder: Directory holding uploaded files and saved indexes
+            max_bytes: Size cap in bytes, CACHE_MAX_BYTES by default
+        """
+        if max_bytes is None:
+            max_bytes = RAGHelper.CACHE_MAX_BYTES
+        
+        # Collect (last use, size, path, is directory) for every entry
+        entries = []
+        for directory in (folder, os.path.join(folder, "chunks"), os.path.join(folder, "embeddings")):
+            if not os.path.isdir(directory):
+                continue
+            for entry in os.scandir(directory):
+                if entry.name.endswith(".tmp") or (directory == folder and entry.name in ("chunks", "embeddings")):
+                    continue
+                try:
+                    if entry.is_dir():
+                        size = sum(
+                            os.path.getsize(os.path.join(root, name))
+                            for root, _, names in os.walk(entry.path) for name in names
+                        )
+                    else:
+                        size = entry.stat().st_size
+                    entries.append((entry.stat().st_mtime, size, entry.path, entry.is_dir()))
+                except FileNotFoundError:
+                    # Removed by another session while scanning
+                    continue
+        
+        # Remove the oldest entries until the rest fits under the cap
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, path, is_dir in sorted(entries):
+            if total <= max_bytes:
+                break
+            if is_dir:
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                with suppress(FileNotFoundError):
+                    os.remove(path)
+            total -= size
+    
+    @staticmethod
+    def unique_files(files: List[Tuple[str, bytes]]) -> Tuple[List[Tuple[str, bytes]], List[str]]:
+        """Drop files whose contents duplicate an earlier file.
+        
+        Each file is hashed once; pass the returned hashes to content_digest
+        instead of hashing the contents again.
+        
+        Args:
+            files: List of (file name, file bytes) pairs
+            
+        Returns:
+            Tuple of the first file of each distinct content, in upload order,
+            and their hex SHA-256 content hashes
+        """
+        seen = set()
+        unique = []
+        file_hashes = []
+        for name, data in files:
+            file_hash = hashlib.sha256(data).hexdigest()
+            if file_hash not in seen:
+                seen.add(file_hash)
+                unique.append((name, data))
+                file_hashes.append(file_hash)
+        return unique, file_hashes
+    
+    @staticmethod
+    def content_digest(file_hashes: Iterable[str]) -> str:
+        """Compute a stable digest for a set of uploaded files.
+        
+        The digest depends only on the distinct file contents, so renaming,
+        reordering or repeating files maps to the same vector store.
+        
+        Args:
+            file_hashes: Hex SHA-256 content hashes, as returned by unique_files
+            
+        Returns:
+            Hex SHA-256 digest of the sorted distinct content hashes
+        """
+        return hashlib.sha256("".join(sorted(set(file_hashes))).encode()).hexdigest()
+    
+    @staticmethod
+    def embedding_backend() -> str:
+        """Return the configured embeddings backend.
+        
+        Set the RAG_EMBEDDINGS environment variable to "local" to embed with
+        a quantized on-device model instead of the OpenAI API.
+        
+        Returns:
+            "local" or "openai"
+        """
+        return "local" if os.environ.get("RAG_EMBEDDINGS", "").strip().lower() == "local" else "openai"
+    
+    @staticmethod
+    def get_embeddings(api_key: str = None, backend: str = "openai") -> Embeddings:
+        """Get a shared embeddings client for the given API key and backend.
+        
+        Reusing one client keeps its HTTP connection pool (or, for the local
+        backend, the loaded model) warm across rebuilds and sessions. The
+        local model doesn't use the key, so one copy serves every key.
+        
+        Args:
+            api_key: Optional OpenAI API key for embeddings
+            backend: "openai" for the OpenAI API or "local" for LOCAL_EMBEDDING_MODEL
+            
+        Returns:
+            Cached embeddings instance
+        """
+        return RAGHelper._embeddings(None if backend == "local" else api_key, backend)
+    
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _embeddings(api_key: Optional[str], backend: str) -> Embeddings:
+        """Build the embeddings client behind get_embeddings, memoized per key and backend."""
+        if backend == "local":
+            # Optional dependency: only needed when local embeddings are enabled
+            from langchain_community.embeddings import FastEmbedEmbeddings
+            return FastEmbedEmbeddings(model_name=RAGHelper.LOCAL_EMBEDDING_MODEL, batch_size=64)
+        
+        embeddings_kwargs = {
+            "chunk_size": RAGHelper.EMBEDDING_BATCH_SIZE,
+            "max_retries": 6,
+            "request_timeout": 30
+        }
+        if api_key:
+            embeddings_kwargs["api_key"] = api_key
+        return OpenAIEmbeddings(**embeddings_kwargs)
+    
+    @staticmethod
+    def cache_backed_embeddings(embeddings: Embeddings, backend: str, folder: str = "tmp") -> Embeddings:
+        """Wrap an embeddings client with a persistent per-chunk vector cache.
+        
+        Vectors are stored under an embeddings/ folder, keyed by a hash of
+        the chunk text and namespaced by backend and model, so only chunks
+        never embedded before reach the embeddings API.
+        
+        Args:
+            embeddings: Embeddings client used on cache misses
+            backend: Embeddings backend name, part of the cache namespace
+            folder: Directory holding uploaded files and saved indexes
+            
+        Returns:
+            Embeddings whose document calls read and fill the cache
+        """
+        from langchain.embeddings import CacheBackedEmbeddings
+        from langchain.storage import LocalFileStore
+        
+        model = getattr(embeddings, "model", None) or getattr(embeddings, "model_name", "")
+        return CacheBackedEmbeddings.from_bytes_store(
+            embeddings,
+            LocalFileStore(os.path.join(folder, "embeddings")),
+            # LocalFileStore keys only allow [A-Za-z0-9_.-/]; "/" would also nest folders
+            namespace=re.sub(r"[^A-Za-z0-9_.-]", "_", f"{backend}-{model}-"),
+            key_encoder="sha256"
+        )
+    
+    @staticmethod
+    def get_query_embedder(api_key: str = None, backend: str = "openai") -> Callable[[str], Tuple[float, ...]]:
+        """Get a memoized query embedding function for an API key and backend.
+        
+        Repeated questions (resubmits, retries, the same question asked in
+        another session) reuse the stored vector instead of another
+        embeddings round-trip.
+        
+        Args:
+            api_key: Optional OpenAI API key for embeddings
+            backend: "openai" for the OpenAI API or "local" for LOCAL_EMBEDDING_MODEL
+            
+        Returns:
+            Function mapping a question to its embedding as an immutable tuple
+        """
+        return RAGHelper._query_embedder(None if backend == "local" else api_key, backend)
+    
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _query_embedder(api_key: Optional[str], backend: str) -> Callable[[str], Tuple[float, ...]]:
+        """Build the function behind get_query_embedder, memoized per key and backend."""
+        embeddings = RAGHelper.get_embeddings(api_key, backend)
+        
+        @lru_cache(maxsize=1024)
+        def embed_query(text: str) -> Tuple[float, ...]:
+            return tuple(embeddings.embed_query(text))
+        
+        return embed_query
+    
+    @staticmethod
+    def embed_texts(embeddings: Embeddings, texts: List[str]) -> List[List[float]]:
+        """Embed texts in fixed-size batches with concurrent requests.
+        
+        Batches are sent through the async client so several embedding
+        requests are in flight at once instead of one after another. They
+        run on the shared background loop, because the cached client's
+        connection pool stays bound to the loop it first ran on.
+        
+        Args:
+            embeddings: Embeddings client to use
+            texts: Texts to embed
+            
+        Returns:
+            One embedding vector per input text, in input order
+        """
+        batch_size = RAGHelper.EMBEDDING_BATCH_SIZE
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        
+        async def embed_all() -> List[List[float]]:
+            # Cap in-flight requests to stay within provider rate limits
+            semaphore = asyncio.Semaphore(RAGHelper.EMBEDDING_CONCURRENCY)
+            
+            async def embed_batch(batch: List[str]) -> List[List[float]]:
+                async with semaphore:
+                    return await embeddings.aembed_documents(batch)
+            
+            results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+            return [vector for batch_vectors in results for vector in batch_vectors]
+        
+        return run_async(embed_all())
+    
+    @staticmethod
+    def create_vector_index(vectors: np.ndarray) -> "faiss.Index":
+        """Create the nearest-neighbour index for document chunks.
+        
+        Corpora below HNSW_MIN_VECTORS chunks use an exact flat index: a
+        single matrix product per query is already sub-millisecond there,
+        and it skips graph construction and quantization loss. Above that,
+        HNSW keeps search cost roughly logarithmic in the number of chunks,
+        and 8-bit scalar quantization stores each vector in a quarter of the
+        float32 size. Queries stay float32. Corpora of IVFPQ_MIN_VECTORS
+        chunks or more switch to IVF-PQ, which compresses each vector to a
+        few dozen bytes and only scans the closest clusters at query time.
+        
+        Args:
+            vectors: Chunk embeddings used to train the quantizer
+            
+        Returns:
+            Trained, empty FAISS index
+        """
+        import faiss
+        
+        count, dimension = vectors.shape
+        if count >= RAGHelper.IVFPQ_MIN_VECTORS:
+            return RAGHelper._create_ivfpq_index(vectors)
+        if count < RAGHelper.HNSW_MIN_VECTORS:
+            # L2 like the other tiers; embeddings are unit length, so the ranking matches cosine
+            return faiss.IndexFlatL2(dimension)
+        
+        index = faiss.IndexHNSWSQ(dimension, faiss.ScalarQuantizer.QT_8bit, 32)
+        index.hnsw.efConstruction = 200
+        index.hnsw.efSearch = 64
+        
+        # The quantizer learns per-dimension value ranges from the corpus
+        index.train(vectors)
+        return index
+    
+    @staticmethod
+    def _create_ivfpq_index(vectors: np.ndarray) -> "faiss.Index":
+        """Create an IVF-PQ index for corpora too large for HNSW.
+        
+        Args:
+            vectors: Chunk embeddings used to train the coarse and product quantizers
+            
+        Returns:
+            Trained, empty FAISS IVF-PQ index with a direct map for MMR
+        """
+        import faiss
+        
+        count, dimension = vectors.shape
+        nlist = min(4096, int(4 * np.sqrt(count)))
+        
+        # Sub-quantizers must divide the dimension; 64 gives 64 bytes per vector at 1536-d
+        subquantizers = next(m for m in (64, 48, 32, 16, 8, 4, 2, 1) if dimension % m == 0)
+        
+        index = faiss.IndexIVFPQ(faiss.IndexFlatL2(dimension), dimension, nlist, subquantizers, 8)
+        index.nprobe = 16
+        
+        # A random sample of about 64 points per cluster is enough to train both quantizers
+        sample_size = min(count, 64 * nlist)
+        sample = vectors[np.random.default_rng(0).choice(count, sample_size, replace=False)]
+        index.train(sample)
+        
+        # MMR reconstructs candidate vectors by id, which IVF only supports with a direct map
+        index.make_direct_map()
+        return index
+    
+    @staticmethod
+    def build_vectorstore(files: List[Tuple[str, bytes]], api_key: str = None,
+                          digest: str = None, folder: str = "tmp") -> "FAISS":
         """Build FAISS vector store from uploaded PDF files.
         
         Processes PDF files, splits them into chunks, creates embeddings,
-        and builds a searchable vector database.
+        and builds a searchable vector database. The index is saved under
+        the content digest, so the same files are only embedded once, and
+        chunk vectors are cached on disk, so a changed file set only embeds
+        chunks that have not been seen before. A saved index that fails to
+        load is rebuilt.
         
         Args:
-            files: List of uploaded PDF files
+            files: List of (file name, file bytes) pairs for the uploaded PDFs
             api_key: Optional OpenAI API key for embeddings
+            digest: Optional precomputed content digest of ``files``
+            folder: Directory holding uploaded files and saved indexes
             
         Returns:
             Configured FAISS vector store ready for similarity search
         """
-        documents: List[Document] = []
+        from langchain_community.vectorstores import FAISS
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        
+        backend = RAGHelper.embedding_backend()
+        embeddings = RAGHelper.get_embeddings(api_key, backend)
+        # Drop repeated contents; the same hashes key the saved index
+        files, file_hashes = RAGHelper.unique_files(files)
+        index_path = os.path.join(folder, f"faiss_{backend}_{digest or RAGHelper.content_digest(file_hashes)}")
         
-        # Process each uploaded PDF file
-        for file in files:
-            file_path = RAGHelper.save_file(file)
-            loader = PyPDFLoader(file_path)
-            documents.extend(loader.load())
+        # Reuse a previously built index for identical content
+        if os.path.isdir(index_path):
+            try:
+                vector_store = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
+                os.utime(index_path)
+                return vector_store
+            except Exception:
+                # An unreadable index is discarded and rebuilt below
+                shutil.rmtree(index_path, ignore_errors=True)
         
-        # Split documents into manageable chunks for processing
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1500, 
-            chunk_overlap=200
+        # Parse and split uploaded PDFs in parallel; map() keeps the file order
+        os.makedirs(folder, exist_ok=True)
+        max_workers = max(1, min(8, os.cpu_count() or 1, len(files)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            chunks_per_file = list(executor.map(
+                lambda file: RAGHelper.load_chunks(file[0], file[1], folder), files
+            ))
+        document_chunks: List[Document] = [chunk for chunks in chunks_per_file for chunk in chunks]
+        
+        texts = [chunk.page_content for chunk in document_chunks]
+        if not texts:
+            raise ValueError("No extractable text found in the uploaded PDFs.")
+        
+        # Create embeddings in concurrent batches and build vector store
+        document_embeddings = RAGHelper.cache_backed_embeddings(embeddings, backend, folder)
+        vectors = np.asarray(RAGHelper.embed_texts(document_embeddings, texts), dtype="float32")
+        vector_store = FAISS(
+            embedding_function=embeddings,
+            index=RAGHelper.create_vector_index(vectors),
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={}
+        )
+        vector_store.add_embeddings(
+            zip(texts, vectors),
+            metadatas=[chunk.metadata for chunk in document_chunks]
         )
-        document_chunks = text_splitter.split_documents(documents)
+        # Save into a private directory and rename it into place, so readers never
+        # load a partial index
+        temp_path = f"{index_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        try:
+            vector_store.save_local(temp_path)
+            with suppress(OSError):
+                # Fails when another session saved the same content first; its index is equivalent
+                os.rename(temp_path, index_path)
+        finally:
+            shutil.rmtree(temp_path, ignore_errors=True)
         
-        embeddings_kwargs = {}
-        if api_key:
-            embeddings_kwargs["api_key"] = api_key
-            
-        # Create embeddings and build vector store
-        embeddings = OpenAIEmbeddings(**embeddings_kwargs)
-        vector_store = FAISS.from_documents(document_chunks, embeddings)
+        # Keep the caches under the folder from growing without bound
+        RAGHelper.prune_cache(folder)
         
         return vector_store
     
     @staticmethod
-    def build_simple_agentic_rag(retriever, llm: ChatOpenAI):
+    def search_by_vector(retriever, query_vector: List[float]) -> List[Document]:
+        """Run a retriever's configured search with a precomputed embedding.
+        
+        Args:
+            retriever: Vector store retriever providing the search settings
+            query_vector: Embedding of the query
+            
+        Returns:
+            Documents matching the query
+        """
+        vector_store = retriever.vectorstore
+        if retriever.search_type == "mmr":
+            return vector_store.max_marginal_relevance_search_by_vector(
+                query_vector, **retriever.search_kwargs
+            )
+        return vector_store.similarity_search_by_vector(query_vector, **retriever.search_kwargs)
+    
+    @staticmethod
+    def top_relevance(vector_store: "FAISS", query_vector: List[float]) -> float:
+        """Cosine similarity between a query and its nearest chunk.
+        
+        The indexes use squared L2 distance over unit-length embeddings, so
+        the similarity is recovered as 1 - distance / 2.
+        
+        Args:
+            vector_store: FAISS vector store to search
+            query_vector: Embedding of the query
+            
+        Returns:
+            Similarity of the closest chunk, or 0.0 for an empty store
+        """
+        results = vector_store.similarity_search_with_score_by_vector(query_vector, k=1)
+        if not results:
+            return 0.0
+        return 1.0 - float(results[0][1]) / 2.0
+    
+    @staticmethod
+    def build_context(documents: List[Document], max_chars: int,
+                      separator: str = "\n\n---\n\n") -> str:
+        """Join retrieved chunks into a prompt context of bounded size.
+        
+        Chunks are taken in retrieval order until the budget is reached;
+        the first chunk is truncated rather than dropped if it alone is too
+        long. Chunks whose text repeats an earlier one (ignoring case and
+        whitespace) are skipped.
+        
+        Args:
+            documents: Retrieved document chunks, most relevant first
+            max_chars: Character budget for the joined context
+            separator: Text placed between chunks
+            
+        Returns:
+            Context string of at most max_chars characters
+        """
+        parts: List[str] = []
+        seen = set()
+        total_chars = 0
+        
+        for doc in documents:
+            content = doc.page_content.strip()
+            fingerprint = " ".join(content.lower().split())
+            if not fingerprint or fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            
+            # Account for the separator joining this chunk to the previous one
+            cost = len(content) + (len(separator) if parts else 0)
+            if total_chars + cost > max_chars:
+                if not parts:
+                    parts.append(content[:max_chars])
+                break
+            
+            parts.append(content)
+            total_chars += cost
+        
+        return separator.join(parts)
+    
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def classify_question(question: str) -> Literal["summary", "fact"]:
+        """Classify a question as a summary request or a fact lookup.
+        
+        Summaries are chosen only when asked for and no specific fact is
+        requested; the first fact hint settles it, so scanning stops there.
+        
+        Args:
+            question: User's question about the documents
+            
+        Returns:
+            "summary" or "fact"
+        """
+        mode: Literal["summary", "fact"] = "fact"
+        for match in _HINTS_RE.finditer(question):
+            if match.lastgroup == "fact":
+                return "fact"
+            mode = "summary"
+        return mode
+    
+    @staticmethod
+    def _retrieve_node(state: RAGState, config: RunnableConfig) -> Dict[str, Any]:
+        """Retrieval node: classify the question, then fetch documents for its mode.
+        
+        Returns only the state keys it changes; LangGraph merges them.
+        """
+        question = state["question"]
+        retriever = config["configurable"]["retriever"]
+        answer_cache = config["configurable"].get("answer_cache")
+        mode = RAGHelper.classify_question(question)
+        
+        # Embed once (memoized when available) and reuse the vector for the cache and the search
+        embed_query = config["configurable"].get("embed_query")
+        if embed_query is not None:
+            query_vector = list(embed_query(question))
+        else:
+            query_vector = retriever.vectorstore.embeddings.embed_query(question)
+        
+        # Answer paraphrased repeats straight from the semantic cache
+        if answer_cache is not None:
+            cached_answer = answer_cache.lookup(query_vector, config["configurable"].get("cache_threshold"))
+            if cached_answer is not None:
+                return {"mode": mode, "documents": [], "generation": cached_answer}
+        
+        # Adjust retrieval count based on response mode
+        num_docs = 8 if mode == "summary" else 3
+        retrieved_docs = RAGHelper.search_by_vector(retriever, query_vector)
+        
+        # Answer with the fallback directly when nothing relevant was found
+        min_relevance = config["configurable"].get("min_relevance") or 0.0
+        if not retrieved_docs or (
+            min_relevance > 0 and RAGHelper.top_relevance(retriever.vectorstore, query_vector) < min_relevance
+        ):
+            return {"mode": mode, "documents": [], "generation": RAGHelper.FALLBACK_ANSWER}
+        
+        return {
+            "mode": mode,
+            "documents": retrieved_docs[:num_docs],
+            "query_embedding": query_vector
+        }
+    
+    @staticmethod
+    def _generate_node(llm: ChatOpenAI, state: RAGState, config: RunnableConfig) -> Dict[str, Any]:
+        """Generation node: answer from the retrieved context in the chosen mode."""
+        answer_cache = config["configurable"].get("answer_cache")
+        
+        # Combine retrieved document content within the mode's size budget
+        document_context = RAGHelper.build_context(
+            state.get("documents", []),
+            RAGHelper.CONTEXT_CHAR_BUDGET[state["mode"]]
+        )
+        
+        # Handle case where no relevant documents found
+        if not document_context.strip():
+            return {"generation": RAGHelper.FALLBACK_ANSWER}
+        
+        # Generate response using appropriate prompt based on mode
+        prompt = _GEN_PROMPT_SUMMARY if state["mode"] == "summary" else _GEN_PROMPT_FACT
+        messages = prompt.format_messages(question=state["question"], context=document_context)
+        
+        # Cap concurrent completions across all sessions
+        with _GENERATION_SLOTS:
+            response = llm.invoke(messages)
+        
+        if answer_cache is not None and state.get("query_embedding"):
+            answer_cache.add(state["query_embedding"], response.content)
+            
+        return {"generation": response.content}
+    
+    @staticmethod
+    def _route_after_retrieve(state: RAGState) -> str:
+        """Skip generation when the answer came from the cache."""
+        from langgraph.graph import END
+        
+        return END if state.get("generation") else "generate"
+    
+    @staticmethod
+    def build_simple_agentic_rag(llm: ChatOpenAI):
         """Build an intelligent agentic RAG workflow.
         
         Creates a graph-based workflow that automatically determines whether
         to provide summaries or specific facts based on the query type.
+        The retriever and optional answer cache are read from
+        ``config["configurable"]`` at invocation time, so one compiled graph
+        can serve every document set.
         
         Args:
-            retriever: Vector store retriever for document search
             llm: Language model for generating responses
             
         Returns:
             Compiled LangGraph workflow for intelligent document QA
         """
         
-        # Classification node: determine if query needs summary or specific facts
-        SUMMARY_HINTS = ("summarize", "summary", "overview", "key points", "bullet", "synthesize")
-        FACT_HINTS = ("when", "date", "who", "where", "amount", "total", "price", "figure", "specific", "exact")
-        
-        def classify_mode(state: RAGHelper.RAGState) -> RAGHelper.RAGState:
-            """Classify query type to determine appropriate response mode."""
-            query_lower = state["question"].lower()
-            
-            # Determine response mode based on query keywords
-            if any(hint in query_lower for hint in SUMMARY_HINTS) and not any(hint in query_lower for hint in FACT_HINTS):
-                mode: Literal["summary", "fact"] = "summary"
-            elif any(hint in query_lower for hint in FACT_HINTS):
-                mode = "fact"
-            else:
-                # Default to summary for general questions, fact for specific queries
-                mode = "summary" if "summary" in query_lower or "summarize" in query_lower else "fact"
-                
-            return {**state, "mode": mode}
-        
-        # Retrieval node: fetch relevant documents based on query type
-        def retrieve(state: RAGHelper.RAGState) -> RAGHelper.RAGState:
-            """Retrieve relevant documents based on query and mode."""
-            question = state["question"]
-            
-            # Adjust retrieval count based on response mode
-            num_docs = 8 if state["mode"] == "summary" else 3
-            retrieved_docs = retriever.invoke(question)
-            
-            return {**state, "documents": retrieved_docs[:num_docs]}
-        
-        # Generation node: create appropriate response based on mode and context
-        gen_prompt_summary = ChatPromptTemplate.from_messages([
-            ("system",
-             "You are a helpful assistant. Create a concise, faithful summary ONLY using the provided context. "
-             "Prefer bullet points if helpful. Do not use outside knowledge."),
-            ("human",
-             "Question:\n{question}\n\n"
-             "Context (multiple document chunks):\n{context}\n\n"
-             "Write a grounded summary:")
-        ])
+        from langgraph.graph import StateGraph, END
         
-        gen_prompt_fact = ChatPromptTemplate.from_messages([
-            ("system",
-             "You are a helpful assistant. Answer precisely and ONLY using the provided context. "
-             "If the context is insufficient, say so."),
-            ("human",
-             "Question:\n{question}\n\n"
-             "Context:\n{context}\n\n"
-             "Answer:")
-        ])
-        
-        def generate(state: RAGHelper.RAGState) -> RAGHelper.RAGState:
-            """Generate response based on retrieved documents and mode."""
-            # Combine retrieved document content
-            document_context = "\n\n---\n\n".join(
-                doc.page_content for doc in state.get("documents", [])
-            )
-            
-            # Handle case where no relevant documents found
-            if not document_context.strip():
-                return {
-                    **state, 
-                    "generation": "I couldn't find enough information in the documents to answer that."
-                }
-            
-            # Generate response using appropriate prompt based on mode
-            if state["mode"] == "summary":
-                response = llm.invoke(gen_prompt_summary.format_messages(
-                    question=state["question"], 
-                    context=document_context
-                ))
-            else:
-                response = llm.invoke(gen_prompt_fact.format_messages(
-                    question=state["question"], 
-                    context=document_context
-                ))
-                
-            return {**state, "generation": response.content}
+        # Only generation depends on the LLM; bind it to the shared node
+        def generate(state: RAGHelper.RAGState, config: RunnableConfig) -> Dict[str, Any]:
+            return RAGHelper._generate_node(llm, state, config)
         
         # Construct the workflow graph with connected nodes
         graph = StateGraph(RAGHelper.RAGState)
-        graph.add_node("classify_mode", classify_mode)
-        graph.add_node("retrieve", retrieve)
+        graph.add_node("retrieve", RAGHelper._retrieve_node)
         graph.add_node("generate", generate)
         
-        graph.set_entry_point("classify_mode")
-        graph.add_edge("classify_mode", "retrieve")
-        graph.add_edge("retrieve", "generate")
+        graph.set_entry_point("retrieve")
+        graph.add_conditional_edges("retrieve", RAGHelper._route_after_retrieve, ["generate", END])
         graph.add_edge("generate", END)
         
         return graph.compile()
     
     @staticmethod
-    def setup_rag_system(uploaded_files, api_key: str = None) -> Any:
+    def setup_rag_system(uploaded_files: List[Tuple[str, bytes]], api_key: str = None,
+                         digest: str = None, folder: str = "tmp") -> Any:
         """Setup complete RAG system from uploaded files.
         
         Orchestrates the entire RAG pipeline: file processing, vectorization,
         retriever setup, and workflow creation.
         
         Args:
-            uploaded_files: List of PDF files to process
+            uploaded_files: List of (file name, file bytes) pairs to process
             api_key: Optional OpenAI API key
+            digest: Optional precomputed content digest of the files
+            folder: Directory holding uploaded files, saved indexes and answers
             
         Returns:
             Complete RAG workflow ready for query processing
         """
         # Build vector store and configure retriever
-        vector_store = RAGHelper.build_vectorstore(uploaded_files, api_key)
-        retriever = vector_store.as_retriever()
+        vector_store = RAGHelper.build_vectorstore(uploaded_files, api_key, digest, folder)
+        # MMR over a wider candidate pool for diverse context; enough for summaries
+        retriever = vector_store.as_retriever(
+            search_type="mmr",
+            search_kwargs={"k": 8, "fetch_k": 32}
+        )
+        
+        # Answers are persisted next to the saved index of the same documents
+        backend = RAGHelper.embedding_backend()
+        cache_path = os.path.join(
+            folder, f"answers_{backend}_{digest or RAGHelper.content_digest(RAGHelper.unique_files(uploaded_files)[1])}.pkl"
+        )
         
-        # Configure language model for generation
+        # Bind this document set to the shared compiled workflow
+        rag_graph = RAGHelper.get_rag_graph("gpt-4o-mini", api_key)
+        return rag_graph.with_config(configurable={
+            "retriever": retriever,
+            "answer_cache": SemanticAnswerCache.for_path(cache_path),
+            "embed_query": RAGHelper.get_query_embedder(api_key, backend)
+        })
+    
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def get_rag_graph(model: str = "gpt-4o-mini", api_key: str = None) -> Any:
+        """Get the compiled RAG workflow for a model and API key.
+        
+        The LLM client, prompts and graph topology do not depend on the
+        uploaded documents, so they are built and compiled only once.
+        
+        Args:
+            model: OpenAI chat model used for generation
+            api_key: Optional OpenAI API key
+            
+        Returns:
+            Compiled LangGraph workflow shared across document sets
+        """
         llm_config = {
-            "model": "gpt-4o-mini", 
+            "model": model, 
             "temperature": 0,  # Deterministic responses
-            "streaming": False
+            "streaming": True,
+            "http_client": _shared_http_client()
         }
         if api_key:
             llm_config["api_key"] = api_key
             
         llm = ChatOpenAI(**llm_config)
-        return RAGHelper.build_simple_agentic_rag(retriever, llm)
+        return RAGHelper.build_simple_agentic_rag(llm)
+    
+    @staticmethod
+    def stream_answer(rag_app: Any, question: str, cache_threshold: Optional[float] = None,
+                      min_relevance: Optional[float] = None) -> Iterator[str]:
+        """Stream the answer to a document question token by token.
+        
+        Yields tokens from the generation node as the LLM produces them.
+        Answers that skip generation (cache hits, missing context) are
+        yielded as a single chunk once the workflow finishes.
+        
+        Args:
+            rag_app: RAG workflow returned by setup_rag_system
+            question: User's question about the documents
+            cache_threshold: Optional similarity needed to reuse a cached answer
+            min_relevance: Optional similarity the closest chunk needs before
+                the LLM is asked; below it the fallback answer is returned
+            
+        Yields:
+            Answer text chunks
+        """
+        initial_state = {"question": question, "mode": "fact", "documents": [], "generation": ""}
+        streamed = False
+        final_state: Dict[str, Any] = {}
+        
+        # Per-call settings are merged into the bound retriever and caches; a
+        # configurable passed to stream() would replace them instead
+        overrides = {"cache_threshold": cache_threshold, "min_relevance": min_relevance}
+        configurable = {key: value for key, value in overrides.items() if value is not None}
+        config = None
+        if configurable:
+            bound = (getattr(rag_app, "config", None) or {}).get("configurable", {})
+            config = {"configurable": {**bound, **configurable}}
+        
+        for stream_mode, payload in rag_app.stream(initial_state, config, stream_mode=["messages", "values"]):
+            if stream_mode == "values":
+                final_state = payload
+                continue
+            
+            chunk, metadata = payload
+            if metadata.get("langgraph_node") == "generate" and chunk.content:
+                streamed = True
+                yield chunk.content
+        
+        if not streamed:
+            yield final_state.get("generation", "").strip() or RAGHelper.FALLBACK_ANSWER
+    
+    @staticmethod
+    def answer_batch(rag_app: Any, questions: List[str], max_concurrency: int = 8) -> List[str]:
+        """Answer several document questions with overlapping workflow runs.
+        
+        Runs the RAG workflow through its batch interface so retrieval and
+        generation for each question proceed concurrently, sharing the same
+        retriever, LLM client and answer cache.
+        
+        Args:
+            rag_app: RAG workflow returned by setup_rag_system
+            questions: Independent questions about the documents
+            max_concurrency: Maximum number of workflow runs in flight at once
+            
+        Returns:
+            Answer text for each question, in input order
+        """
+        states = rag_app.batch(
+            [{"question": question, "mode": "fact", "documents": [], "generation": ""} for question in questions],
+            config={"max_concurrency": max_concurrency}
+        )
+        return [state.get("generation", "").strip() or RAGHelper.FALLBACK_ANSWER for state in states]
 
 
 class MCPHelper:
@@ -445,6 +1689,23 @@ class MCPHelper:
             return response_text
         except Exception as e:
             return f"❌ MCP Agent Error: {str(e)}"
+    
+    @staticmethod
+    async def stream_mcp_query(agent: Any, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """Stream a query's answer from the MCP agent.
+        
+        Args:
+            agent: The MCP agent instance
+            messages: List of conversation messages
+            
+        Yields:
+            Response text chunks, or an error message if processing fails
+        """
+        try:
+            async for chunk in agent.astream(messages):
+                yield chunk
+        except Exception as e:
+            yield f"❌ MCP Agent Error: {str(e)}"
 
 
 class ValidationHelper:
@@ -455,6 +1716,7 @@ class ValidationHelper:
     """
     
     @staticmethod
+    @lru_cache(maxsize=128)
     def validate_openai_key(api_key: str) -> bool:
         """Validate OpenAI API key format.
         
@@ -464,9 +1726,10 @@ class ValidationHelper:
         Returns:
             True if key format is valid, False otherwise
         """
-        return api_key and api_key.startswith("sk-")
+        return bool(api_key) and api_key.startswith("sk-")
     
     @staticmethod
+    @lru_cache(maxsize=128)
     def validate_tavily_key(api_key: str) -> bool:
         """Validate Tavily API key format.
         
@@ -476,9 +1739,10 @@ class ValidationHelper:
         Returns:
             True if key format is valid, False otherwise
         """
-        return api_key and api_key.startswith("tvly-")
+        return bool(api_key) and api_key.startswith("tvly-")
     
     @staticmethod
+    @lru_cache(maxsize=128)
     def validate_mcp_url(url: str) -> bool:
         """Validate MCP server URL format.
         
@@ -488,4 +1752,14 @@ class ValidationHelper:
         Returns:
             True if URL format is valid, False otherwise
         """
-        return url and (url.startswith("http://") or url.startswith("https://"))
\ No newline at end of file
+        if not url:
+            return False
+        
+        # A scheme alone ("https://") is not a server; require a host as well
+        try:
+            parts = urlsplit(url)
+            # Reading the port validates it; "http://host:99999" raises ValueError
+            parts.port
+        except ValueError:
+            return False
+        return parts.scheme.lower() in _URL_SCHEMES and bool(parts.hostname)
\ No newline at end of file
@@ -6,6 +6,7 @@ and reliable message processing.
 """
 
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
 
 from ui_components import ChatbotUI, APIKeyUI
@@ -52,6 +53,70 @@ def configure_api_key() -> bool:
     
     return True
 
+@st.cache_resource(show_spinner=False, max_entries=16)
+def get_chain(api_key: str) -> Any:
+    """Build the chatbot chain once per API key and share it across sessions.
+    
+    The chain holds no conversation state, so every session using the
+    same key can reuse it.
+    
+    Args:
+        api_key: OpenAI API key for the chain's LLM
+        
+    Returns:
+        LangChain chain configured with the default chatbot settings
+    """
+    return BasicChatbotHelper.build_chain(BasicChatbotHelper.get_default_config(), api_key)
+
+@st.cache_resource(show_spinner=False)
+def get_summary_executor() -> ThreadPoolExecutor:
+    """Start one worker pool for conversation summary updates.
+    
+    Summaries are refreshed in the background so the script thread is
+    free as soon as a reply has streamed.
+    
+    Returns:
+        Thread pool shared across reruns and sessions
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="chat-summary")
+
+def collect_summary() -> None:
+    """Apply the result of a finished background summary update.
+    
+    An update still running is left for a later run; until then, the
+    previous summary and its start index remain consistent.
+    """
+    future = st.session_state.get("basic_summary_future")
+    if future is None or not future.done():
+        return
+    
+    st.session_state.basic_summary_future = None
+    try:
+        st.session_state.basic_summary, st.session_state.basic_summary_upto = future.result()
+    except Exception as e:
+        # The previous summary is kept and retried after the next reply
+        st.warning(f"Couldn't update the conversation summary: {str(e)}")
+
+def schedule_summary(api_key: str) -> None:
+    """Fold older turns into the summary in the background when due.
+    
+    Args:
+        api_key: OpenAI API key for the summarizing model
+    """
+    messages = st.session_state.basic_messages
+    start = st.session_state.get("basic_summary_upto", 0)
+    if st.session_state.get("basic_summary_future") or not BasicChatbotHelper.summary_due(messages, start):
+        return
+    
+    # Pass a copy so later turns can't change the history mid-summary
+    st.session_state.basic_summary_future = get_summary_executor().submit(
+        BasicChatbotHelper.update_summary,
+        api_key,
+        st.session_state.get("basic_summary", ""),
+        list(messages),
+        start
+    )
+
 def display_messages() -> None:
     """Display chat messages using centralized UI components.
     
@@ -61,6 +126,37 @@ def display_messages() -> None:
     if not ChatbotUI.display_chat_messages(st.session_state.basic_messages):
         st.info("🤖 Ask me anything and I'll be happy to help!")
 
+def answer_query(chain: Any, api_key: str, user_input: str) -> None:
+    """Stream the reply to the latest user message in the current run.
+    
+    Args:
+        chain: LangChain chain used to generate the reply
+        api_key: OpenAI API key, used to refresh the conversation summary
+        user_input: The user's message, already appended to the history
+    """
+    with st.chat_message("assistant", avatar=ChatbotUI.get_bot_avatar()):
+        try:
+            # Older turns travel as a summary; only recent ones are sent verbatim
+            response = st.write_stream(ChatbotUI.coalesce_stream(BasicChatbotHelper.stream_with_memory(
+                chain, 
+                user_input, 
+                st.session_state.basic_messages,
+                st.session_state.get("basic_summary", ""),
+                st.session_state.get("basic_summary_upto", 0)
+            )))
+            
+            # Add assistant response; it is already on screen, so no rerun
+            st.session_state.basic_messages.append({
+                "role": "assistant", 
+                "content": response
+            })
+            
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+            return
+    
+    schedule_summary(api_key)
+
 def main() -> None:
     """Main application function.
     
@@ -88,63 +184,31 @@ def main() -> None:
     # Initialize chat interface and processing logic
     with st.container():
         
-        # Configure LangChain with default chatbot settings
-        config = BasicChatbotHelper.get_default_config()
+        # Shared chain for the current API key
         api_key = st.session_state.get("basic_openai_key", "")
-        
-        # Ensure chain is properly initialized with current API key
-        if api_key and ("basic_chain" not in st.session_state or 
-                       st.session_state.get("basic_current_api_key") != api_key):
-            st.session_state.basic_chain = BasicChatbotHelper.build_chain(config, api_key)
-            st.session_state.basic_current_api_key = api_key
-        elif not api_key:
+        if not api_key:
             st.error("API key not found. Please refresh the page.")
             return
+        chain = get_chain(api_key)
         
         # Initialize conversation history in session state
         if "basic_messages" not in st.session_state:
             st.session_state.basic_messages = []
         
+        # Pick up a summary refreshed in the background since the last run
+        collect_summary()
+        
         # Render current conversation history
         display_messages()
-        
-        # Process pending user message and generate AI response
-        if (st.session_state.basic_messages and 
-            st.session_state.basic_messages[-1]["role"] == "user" and
-            not st.session_state.get("basic_processing", False)):
-            
-            st.session_state.basic_processing = True
-            try:
-                # Show processing indicator
-                with st.chat_message("assistant", avatar=ChatbotUI.get_bot_avatar()):
-                    with st.spinner("Thinking..."):
-                        # Get the last user message
-                        user_input = st.session_state.basic_messages[-1]["content"]
-                        response = BasicChatbotHelper.invoke_with_memory(
-                            st.session_state.basic_chain, 
-                            user_input, 
-                            st.session_state.basic_messages
-                        )
-                        
-                        # Add assistant response
-                        st.session_state.basic_messages.append({
-                            "role": "assistant", 
-                            "content": response.content
-                        })
-                
-                st.session_state.basic_processing = False
-                st.rerun()
-                
-            except Exception as e:
-                st.session_state.basic_processing = False
-                st.error(f"Error: {str(e)}")
-                st.rerun()
 
     # Chat input - outside container to prevent shifting
     if prompt := st.chat_input("Type your message here..."):
-        # Add user message and rerun to show it first
+        # Add user message and render it right away
         st.session_state.basic_messages.append({"role": "user", "content": prompt})
-        st.rerun()
+        with st.chat_message("user", avatar=ChatbotUI.get_user_avatar()):
+            st.markdown(prompt)
+        
+        answer_query(chain, api_key, prompt)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,11 +6,10 @@ for current information and real-time data queries.
 """
 
 import streamlit as st
-import asyncio
 from typing import Dict, Any, List
 
 from ui_components import ChatbotUI, APIKeyUI
-from langchain_helpers import AgentChatbotHelper, ValidationHelper
+from langchain_helpers import AgentChatbotHelper, ValidationHelper, run_async
     
 
 def configure_api_keys() -> bool:
@@ -71,95 +70,54 @@ def configure_api_keys() -> bool:
     
     return True
 
-class ChatbotTools:
-    """Core functionality class for the agent chatbot.
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_agent(openai_key: str, tavily_key: str) -> Any:
+    """Build the web search-enabled agent once per pair of API keys.
     
-    Manages agent setup, message display, and response processing
-    with web search capabilities through Tavily integration.
-    """
-    def setup_agent(self) -> Any:
-        """Setup the web search-enabled agent.
-        
-        Returns:
-            Configured LangGraph agent with Tavily search tools
-        """
-        openai_key = st.session_state.get("agent_openai_key", "")
-        tavily_key = st.session_state.get("agent_tavily_key", "")
-        return AgentChatbotHelper.setup_agent(openai_key, tavily_key)
+    The agent keeps no conversation state (history is passed per query),
+    so sessions using the same keys share it instead of rebuilding the
+    LLM client, search tool and graph on every rerun.
     
-    def display_messages(self) -> None:
-        """Display chat messages with web search context awareness.
+    Args:
+        openai_key: OpenAI API key for the agent's LLM
+        tavily_key: Tavily API key for the search tool
         
-        Shows conversation history or informative welcome message
-        highlighting the agent's web search capabilities.
-        """
-        if not st.session_state.agent_messages:
-            st.info("🌐 Ask me anything and I'll search the web for real-time information!")
-        else:
-            for message in st.session_state.agent_messages:
-                if message["role"] == "user":
-                    with st.chat_message("user", avatar=ChatbotUI.get_user_avatar()):
-                        st.write(message["content"])
-                else:
-                    with st.chat_message("assistant", avatar=ChatbotUI.get_bot_avatar()):
-                        st.write(message["content"])
+    Returns:
+        Configured LangGraph agent with Tavily search tools
+    """
+    return AgentChatbotHelper.setup_agent(openai_key, tavily_key)
 
-    def main(self) -> None:
-        """Main agent chatbot logic.
-        
-        Manages the complete agent workflow including message processing,
-        web search integration, and streaming response handling.
-        """
-        # Initialize agent-specific conversation history
-        if "agent_messages" not in st.session_state:
-            st.session_state.agent_messages = []
+def display_messages() -> None:
+    """Display chat messages with web search context awareness.
+    
+    Shows conversation history or informative welcome message
+    highlighting the agent's web search capabilities.
+    """
+    if not ChatbotUI.display_chat_messages(st.session_state.agent_messages):
+        st.info("🌐 Ask me anything and I'll search the web for real-time information!")
+
+def answer_query(agent: Any, user_query: str) -> None:
+    """Answer a user query through the web search agent in the current run.
+    
+    Args:
+        agent: Configured LangGraph agent with Tavily search tools
+        user_query: The user's question
+    """
+    with st.chat_message("assistant", avatar=ChatbotUI.get_bot_avatar()):
+        try:
+            with st.spinner("Searching the web..."):
+                # Process query through agent on the persistent loop
+                response = run_async(
+                    AgentChatbotHelper.process_agent_response(agent, user_query)
+                )
             
-        # Configure agent with web search capabilities
-        agent = self.setup_agent()
-        
-        # Render current conversation with search context
-        self.display_messages()
-        
-        # Process user query through web search agent
-        if (st.session_state.agent_messages and 
-            st.session_state.agent_messages[-1]["role"] == "user" and
-            not st.session_state.get("agent_processing", False)):
+            st.write(response)
             
-            st.session_state.agent_processing = True
-            try:
-                # Show processing indicator
-                with st.chat_message("assistant", avatar=ChatbotUI.get_bot_avatar()):
-                    with st.spinner("Searching the web..."):
-                        # Extract user query for web search processing
-                        user_query = st.session_state.agent_messages[-1]["content"]
-                        
-                        # Process query through agent with search capabilities
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        try:
-                            response = loop.run_until_complete(
-                                AgentChatbotHelper.process_agent_response(agent, user_query)
-                            )
-                        finally:
-                            loop.close()
-                        
-                        # Add assistant response
-                        st.session_state.agent_messages.append({"role": "assistant", "content": response})
-                
-                st.session_state.agent_processing = False
-                st.rerun()
-                
-            except Exception as e:
-                st.session_state.agent_processing = False
-                st.error(f"Error: {str(e)}")
-                st.rerun()
-        
-        # Chat input for web search queries
-        if prompt := st.chat_input("Ask me anything about current events..."):
-            # Add user message to conversation history
-            st.session_state.agent_messages.append({"role": "user", "content": prompt})
-            st.rerun()
-
+            # Add assistant response
+            st.session_state.agent_messages.append({"role": "assistant", "content": response})
+            
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
 
 def main() -> None:
     """Main application function for the agent chatbot page.
@@ -179,9 +137,27 @@ def main() -> None:
     if not configure_api_keys():
         return
     
-    # Initialize and run the agent chatbot interface
-    obj = ChatbotTools()
-    obj.main()
+    # Initialize agent-specific conversation history
+    if "agent_messages" not in st.session_state:
+        st.session_state.agent_messages = []
+        
+    # Shared agent with web search capabilities for the current keys
+    agent = get_agent(
+        st.session_state.get("agent_openai_key", ""),
+        st.session_state.get("agent_tavily_key", "")
+    )
+    
+    # Render current conversation with search context
+    display_messages()
+    
+    # Chat input for web search queries
+    if prompt := st.chat_input("Ask me anything about current events..."):
+        # Add user message and render it right away
+        st.session_state.agent_messages.append({"role": "user", "content": prompt})
+        with st.chat_message("user", avatar=ChatbotUI.get_user_avatar()):
+            st.markdown(prompt)
+        
+        answer_query(agent, prompt)
 
 if __name__ == "__main__":
     main()
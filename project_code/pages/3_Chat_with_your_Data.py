@@ -6,7 +6,8 @@ Features automatic document processing, vector search, and contextual responses.
 """
 
 import streamlit as st
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Tuple
 
 from ui_components import ChatbotUI, APIKeyUI
 from langchain_helpers import RAGHelper, ValidationHelper
@@ -26,82 +27,7 @@ def setup_page() -> None:
     )
     
     # Enhanced visual styling
-    st.markdown("""
-    <style>
-        /* Enhanced chat styling */
-        .stChatMessage {
-            padding: 1rem;
-            margin: 0.5rem 0;
-            border-radius: 15px;
-            background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
-            border: 1px solid rgba(0, 212, 170, 0.1);
-            box-shadow: 0 2px 10px rgba(0, 0, 0, 0.3);
-        }
-        
-        /* Enhanced buttons */
-        .stButton > button {
-            background: linear-gradient(135deg, #00d4aa, #00a883);
-            border: none;
-            border-radius: 10px;
-            color: white;
-            font-weight: 600;
-            padding: 0.75rem 2rem;
-            transition: all 0.3s ease;
-            box-shadow: 0 4px 15px rgba(0, 212, 170, 0.3);
-        }
-        
-        .stButton > button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 6px 20px rgba(0, 212, 170, 0.4);
-            background: linear-gradient(135deg, #00e6c0, #00cc99);
-        }
-        
-        /* Enhanced text inputs */
-        .stTextInput > div > div > input {
-            background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
-            border: 2px solid rgba(0, 212, 170, 0.2);
-            border-radius: 10px;
-            color: #ffffff;
-            font-size: 16px;
-            padding: 12px;
-            transition: all 0.3s ease;
-        }
-        
-        .stTextInput > div > div > input:focus {
-            border-color: #00d4aa;
-            box-shadow: 0 0 20px rgba(0, 212, 170, 0.3);
-        }
-        
-        /* Enhanced file uploader */
-        .stFileUploader > div {
-            background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
-            border: 2px dashed rgba(0, 212, 170, 0.3);
-            border-radius: 15px;
-            padding: 2rem;
-            text-align: center;
-            transition: all 0.3s ease;
-        }
-        
-        .stFileUploader > div:hover {
-            border-color: #00d4aa;
-            box-shadow: 0 0 20px rgba(0, 212, 170, 0.2);
-        }
-        
-        /* Enhanced titles */
-        h1 {
-            background: linear-gradient(135deg, #00d4aa, #ffffff);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            font-weight: 800;
-            text-shadow: 0 0 30px rgba(0, 212, 170, 0.5);
-        }
-        
-        /* Enhanced progress bars */
-        .stProgress > div > div {
-            background: linear-gradient(135deg, #00d4aa, #00a883);
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(ChatbotUI.load_css("rag.css"), unsafe_allow_html=True)
     
 
 def configure_api_key() -> bool:
@@ -116,33 +42,65 @@ def configure_api_key() -> bool:
     api_key = st.session_state.get("rag_openai_key", "")
     
     if not api_key:
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            st.markdown("### 🔑 Enter API Key")
-            
-            # Handle post-connection state to prevent form re-display
-            if st.session_state.get("rag_key_connected", False):
-                st.session_state["rag_key_connected"] = False
-                return True
+        connected = False
+        
+        # Render the form in a placeholder so it can be cleared once connected
+        form_slot = st.empty()
+        with form_slot.container():
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                st.markdown("### 🔑 Enter API Key")
+                    
+                api_key_input = st.text_input(
+                    "OpenAI API Key",
+                    type="password",
+                    placeholder="sk-proj-...",
+                    key="rag_api_key_input"
+                )
                 
-            api_key_input = st.text_input(
-                "OpenAI API Key",
-                type="password",
-                placeholder="sk-proj-...",
-                key="rag_api_key_input"
-            )
-            
-            if st.button("Connect", type="primary", use_container_width=True):
-                if ValidationHelper.validate_openai_key(api_key_input):
-                    st.session_state["rag_openai_key"] = api_key_input
-                    st.session_state["rag_key_connected"] = True
-                    st.rerun()
-                else:
-                    st.error("❌ Invalid key format")
+                if st.button("Connect", type="primary", use_container_width=True):
+                    if ValidationHelper.validate_openai_key(api_key_input):
+                        st.session_state["rag_openai_key"] = api_key_input
+                        connected = True
+                    else:
+                        st.error("❌ Invalid key format")
+        
+        # Continue to the uploader in this run instead of rerunning the script
+        if connected:
+            form_slot.empty()
+            return True
         return False
     
     return True
 
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_rag_system(digest: str, api_key: str, _files: List[Tuple[str, bytes]]) -> Any:
+    """Build the RAG workflow once per document set and API key.
+    
+    At most eight workflows are kept; the least recently used one is
+    evicted together with its in-memory index and answer cache.
+    
+    Args:
+        digest: Content digest identifying the uploaded files
+        api_key: OpenAI API key used for embeddings and generation
+        _files: List of (file name, file bytes) pairs (excluded from hashing)
+        
+    Returns:
+        Cached RAG workflow for the document set
+    """
+    return RAGHelper.setup_rag_system(_files, api_key, digest)
+
+
+@st.cache_resource
+def get_build_lock() -> threading.Lock:
+    """Lock shared by all sessions so only one document set is indexed at a time.
+    
+    Returns:
+        Process-wide lock guarding vector store builds
+    """
+    return threading.Lock()
+
+
 class CustomDataChatbot:
     """RAG-powered chatbot for document question answering.
     
@@ -154,17 +112,21 @@ class CustomDataChatbot:
         """Initialize the RAG chatbot with default settings."""
         self.openai_model = "gpt-4o-mini"
 
-    def setup_graph(self, uploaded_files: List[Any]) -> Any:
+    def setup_graph(self, uploaded_files: List[Tuple[str, bytes]], digest: str) -> Any:
         """Setup RAG processing graph from uploaded documents.
         
         Args:
-            uploaded_files: List of Streamlit uploaded file objects
+            uploaded_files: List of (file name, file bytes) pairs with distinct contents
+            digest: Content digest of the files
             
         Returns:
             Configured RAG workflow for document Q&A
         """
         api_key = st.session_state.get("rag_openai_key", "")
-        return RAGHelper.setup_rag_system(uploaded_files, api_key)
+        
+        # Serialize builds so concurrent uploads don't compete for embeddings quota and CPU
+        with get_build_lock():
+            return load_rag_system(digest, api_key, uploaded_files)
     
     def display_messages(self) -> None:
         """Display document-aware chat messages.
@@ -172,14 +134,7 @@ class CustomDataChatbot:
         Shows conversation history with document context awareness
         and helpful prompts for document-based queries.
         """
-        if st.session_state.rag_messages:
-            for message in st.session_state.rag_messages:
-                if message["role"] == "user":
-                    with st.chat_message("user", avatar=ChatbotUI.get_user_avatar()):
-                        st.write(message["content"])
-                else:
-                    with st.chat_message("assistant", avatar=ChatbotUI.get_bot_avatar()):
-                        st.write(message["content"])
+        ChatbotUI.display_chat_messages(st.session_state.rag_messages)
 
     def main(self) -> None:
         """Main RAG chatbot workflow.
@@ -188,8 +143,8 @@ class CustomDataChatbot:
         and intelligent question-answering over document content.
         """
         # Initialize RAG-specific session state variables
-        if "rag_uploaded_files" not in st.session_state:
-            st.session_state.rag_uploaded_files = []
+        if "rag_file_digest" not in st.session_state:
+            st.session_state.rag_file_digest = ""
         if "rag_app" not in st.session_state:
             st.session_state.rag_app = None
         if "rag_messages" not in st.session_state:
@@ -207,17 +162,41 @@ class CustomDataChatbot:
             # Document processing handled automatically upon upload
                 
         st.markdown("<br>", unsafe_allow_html=True)
+        
+        # How similar a new question must be to reuse a previous answer
+        st.sidebar.slider(
+            "Answer cache similarity",
+            min_value=0.80,
+            max_value=1.0,
+            value=0.97,
+            step=0.01,
+            key="rag_cache_threshold",
+            help="Questions at least this similar to an earlier one reuse its answer. 1.0 disables reuse of paraphrases."
+        )
+        
+        # How relevant the best chunk must be before the LLM is asked at all
+        st.sidebar.slider(
+            "Minimum document relevance",
+            min_value=0.0,
+            max_value=0.9,
+            value=0.2,
+            step=0.05,
+            key="rag_min_relevance",
+            help="Questions whose closest document chunk is less similar than this get the fallback answer without an LLM call. 0 disables the check."
+        )
 
         # Process documents when uploaded or changed
         if uploaded_files:
-            current_files = {f.name for f in uploaded_files}
-            previous_files = {f.name for f in st.session_state.get("rag_uploaded_files", [])}
+            # Read and hash each upload once, drop repeated contents and key the set by
+            # content, so renamed or duplicate uploads don't trigger a rebuild
+            blobs, file_hashes = RAGHelper.unique_files([(f.name, f.getvalue()) for f in uploaded_files])
+            digest = RAGHelper.content_digest(file_hashes)
             
-            # Rebuild RAG system if files changed or system not initialized
-            if current_files != previous_files or st.session_state.rag_app is None:
-                st.session_state.rag_uploaded_files = uploaded_files
+            # Rebuild RAG system if file contents changed or system not initialized
+            if digest != st.session_state.rag_file_digest or st.session_state.rag_app is None:
+                st.session_state.rag_file_digest = digest
                 with st.spinner("📚 Processing documents..."):
-                    st.session_state.rag_app = self.setup_graph(uploaded_files)
+                    st.session_state.rag_app = self.setup_graph(blobs, digest)
         else:
             # Show welcome message when no documents are uploaded
             if not st.session_state.rag_messages:
@@ -226,50 +205,38 @@ class CustomDataChatbot:
             
         # Render conversation history with document context
         self.display_messages()
+
+        # Document query input interface
+        if prompt := st.chat_input("Ask about your documents..."):
+            # Show the query immediately and answer it within the same run
+            st.session_state.rag_messages.append({"role": "user", "content": prompt})
+            with st.chat_message("user", avatar=ChatbotUI.get_user_avatar()):
+                st.write(prompt)
+            self.answer_query(prompt)
+
+    def answer_query(self, user_query: str) -> None:
+        """Answer a document query and add the response to the conversation.
         
-        # Process document-based query and generate contextual response
-        if (st.session_state.rag_messages and 
-            st.session_state.rag_messages[-1]["role"] == "user" and
-            not st.session_state.get("rag_processing", False)):
-            
-            st.session_state.rag_processing = True
+        Args:
+            user_query: The user's question about the uploaded documents
+        """
+        with st.chat_message("assistant", avatar=ChatbotUI.get_bot_avatar()):
             try:
-                # Show processing indicator
-                with st.chat_message("assistant", avatar=ChatbotUI.get_bot_avatar()):
-                    with st.spinner("Analyzing documents..."):
-                        # Extract user query for document analysis
-                        user_query = st.session_state.rag_messages[-1]["content"]
-                        
-                        # Process query through RAG workflow
-                        result = st.session_state.rag_app.invoke({
-                            "question": user_query, 
-                            "mode": "fact", 
-                            "documents": [], 
-                            "generation": ""
-                        })
-                        
-                        # Extract generated response with fallback
-                        answer = (
-                            result.get("generation", "").strip() or 
-                            "I couldn't find enough information in the documents to answer that."
+                with st.spinner("Analyzing documents..."):
+                    # Stream the answer into the bubble as it is generated
+                    answer = st.write_stream(ChatbotUI.coalesce_stream(
+                        RAGHelper.stream_answer(
+                            st.session_state.rag_app,
+                            user_query,
+                            st.session_state.get("rag_cache_threshold", 0.97),
+                            st.session_state.get("rag_min_relevance", 0.2)
                         )
-                        
-                        # Add assistant response
-                        st.session_state.rag_messages.append({"role": "assistant", "content": answer})
+                    ))
                 
-                st.session_state.rag_processing = False
-                st.rerun()
+                st.session_state.rag_messages.append({"role": "assistant", "content": answer})
                 
             except Exception as e:
-                st.session_state.rag_processing = False
                 st.error(f"Error: {str(e)}")
-                st.rerun()
-
-        # Document query input interface
-        if prompt := st.chat_input("Ask about your documents..."):
-            # Add user query to conversation history
-            st.session_state.rag_messages.append({"role": "user", "content": prompt})
-            st.rerun()
 
 def main() -> None:
     """Main application function for the RAG chatbot page.
@@ -1,7 +1,7 @@
 # server.py
 from mcp.server.fastmcp import FastMCP
 from langmem import create_prompt_optimizer
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Tuple, Any
 import json
 import datetime
 import os
@@ -47,15 +47,14 @@ from pathlib import Path
 
 OPTIMIZATION_FILE = Path("tmp/optimization_history.json")
 
-def load_optimization_history() -> List[Dict[str, Any]]:
-    """Load optimization history from file"""
+def load_optimization_history() -> Optional[List[Dict[str, Any]]]:
+    """Load optimization history from file, or None if it can't be read"""
     try:
-        if OPTIMIZATION_FILE.exists():
-            with open(OPTIMIZATION_FILE, 'r') as f:
-                return json.load(f)
+        with open(OPTIMIZATION_FILE, 'r') as f:
+            return json.load(f)
     except Exception as e:
         print(f"Error loading optimization history: {e}")
-    return []
+    return None
 
 def save_optimization_history(history: List[Dict[str, Any]]) -> None:
     """Save optimization history to file"""
@@ -66,8 +65,30 @@ def save_optimization_history(history: List[Dict[str, Any]]) -> None:
     except Exception as e:
         print(f"Error saving optimization history: {e}")
 
+# (modification time, size) of the history file when it was last loaded;
+# the size catches rewrites within the filesystem's timestamp granularity
+_history_stamp: Optional[Tuple[int, int]] = None
+
+def refresh_optimization_history() -> List[Dict[str, Any]]:
+    """Reload optimization history only if the file changed since the last load"""
+    global optimization_history, _history_stamp
+    try:
+        stat = OPTIMIZATION_FILE.stat()
+    except OSError:
+        return optimization_history
+    
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    if stamp != _history_stamp:
+        history = load_optimization_history()
+        # A failed parse (e.g. a file caught mid-write) keeps the last good copy and retries next call
+        if history is not None:
+            optimization_history = history
+            _history_stamp = stamp
+    return optimization_history
+
 # Load existing optimization history
-optimization_history = load_optimization_history()
+optimization_history: List[Dict[str, Any]] = []
+refresh_optimization_history()
 
 @mcp.tool()
 async def optimize_prompt(
@@ -190,9 +211,8 @@ def get_optimization_history(limit: int = 5) -> str:
 @mcp.tool()
 def get_latest_optimized_prompt() -> str:
     """Get the most recent optimized prompt for use in conversations"""
-    # Reload from file to get latest optimizations
-    global optimization_history
-    optimization_history = load_optimization_history()
+    # Pick up optimizations written by other processes; unchanged files are not re-read
+    refresh_optimization_history()
     
     if not optimization_history:
         return "You are a helpful AI assistant"
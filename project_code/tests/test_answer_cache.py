@@ -0,0 +1,78 @@
+"""Tests for the semantic answer cache."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+pytest.importorskip("langchain_openai")
+
+from langchain_helpers import SemanticAnswerCache
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype="float32")
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def test_lookup_matches_similar_questions_only():
+    cache = SemanticAnswerCache(threshold=0.95)
+    cache.add(unit(1, 0, 0), "answer")
+    
+    assert cache.lookup(unit(1, 0.01, 0)) == "answer"
+    assert cache.lookup(unit(0, 1, 0)) is None
+
+
+def test_threshold_override_applies_per_lookup():
+    cache = SemanticAnswerCache(threshold=0.99)
+    cache.add(unit(1, 0, 0), "answer")
+    
+    # Cosine similarity of about 0.9: a miss by default, a hit with a looser threshold
+    assert cache.lookup(unit(1, 0.5, 0)) is None
+    assert cache.lookup(unit(1, 0.5, 0), threshold=0.85) == "answer"
+
+
+def test_oldest_answer_is_evicted_at_capacity():
+    cache = SemanticAnswerCache(max_entries=2)
+    cache.add(unit(1, 0, 0), "first")
+    cache.add(unit(0, 1, 0), "second")
+    cache.add(unit(0, 0, 1), "third")
+    
+    assert cache.lookup(unit(1, 0, 0)) is None
+    assert cache.lookup(unit(0, 1, 0)) == "second"
+    assert cache.lookup(unit(0, 0, 1)) == "third"
+
+
+def test_answers_are_saved_together_and_reloaded(tmp_path, monkeypatch):
+    monkeypatch.setattr(SemanticAnswerCache, "SAVE_DELAY", 60.0)
+    path = tmp_path / "answers.pkl"
+    cache = SemanticAnswerCache(path=str(path))
+    cache.add(unit(1, 0, 0), "first")
+    timer = cache._save_timer
+    cache.add(unit(0, 1, 0), "second")
+    
+    # Both answers share one deferred save, and nothing is written yet
+    assert cache._save_timer is timer
+    assert not path.exists()
+    
+    # Run the pending save now instead of waiting for the timer
+    timer.cancel()
+    cache._save()
+    
+    reloaded = SemanticAnswerCache(path=str(path))
+    assert reloaded.lookup(unit(1, 0, 0)) == "first"
+    assert reloaded.lookup(unit(0, 1, 0)) == "second"
+
+
+def test_unreadable_file_loads_as_empty_cache(tmp_path):
+    path = tmp_path / "answers.pkl"
+    path.write_bytes(b"truncated")
+    
+    assert SemanticAnswerCache(path=str(path)).lookup(unit(1, 0, 0)) is None
+
+
+def test_for_path_shares_one_cache_per_file(tmp_path):
+    path = str(tmp_path / "answers.pkl")
+    
+    first = SemanticAnswerCache.for_path(path)
+    assert SemanticAnswerCache.for_path(path) is first
+    assert SemanticAnswerCache.for_path(str(tmp_path / "other.pkl")) is not first
@@ -0,0 +1,52 @@
+"""Tests for chat history formatting and streamed reply coalescing."""
+
+import pytest
+
+pytest.importorskip("langchain_openai")
+
+from langchain_helpers import BasicChatbotHelper
+
+
+def test_format_history_maps_roles_and_skips_others():
+    history = [
+        {"role": "user", "content": "hi"},
+        {"role": "system", "content": "ignored"},
+        {"role": "assistant", "content": "hello"},
+    ]
+    
+    assert BasicChatbotHelper.format_history(history) == [("human", "hi"), ("assistant", "hello")]
+
+
+def test_format_history_keeps_newest_messages_within_budget():
+    # Each 40-character message is estimated at 11 tokens
+    history = [{"role": "user", "content": str(i) * 40} for i in range(3)]
+    
+    kept = BasicChatbotHelper.format_history(history, token_budget=25)
+    
+    assert kept == [("human", "1" * 40), ("human", "2" * 40)]
+
+
+def test_memory_messages_sends_summary_and_recent_turns():
+    history = [
+        {"role": "user", "content": "old question"},
+        {"role": "assistant", "content": "old answer"},
+        {"role": "user", "content": "recent question"},
+        {"role": "assistant", "content": "recent answer"},
+        {"role": "user", "content": "current question"},
+    ]
+    
+    messages = BasicChatbotHelper.memory_messages(history, summary="earlier", start=2)
+    
+    assert messages[0][0] == "system" and "earlier" in messages[0][1]
+    assert messages[1:] == [("human", "recent question"), ("assistant", "recent answer")]
+
+
+def test_coalesce_stream_merges_chunks_between_redraws():
+    pytest.importorskip("streamlit")
+    from ui_components import ChatbotUI
+    
+    chunks = ["a", "b", "c"]
+    
+    assert list(ChatbotUI.coalesce_stream(iter(chunks), interval=3600)) == ["abc"]
+    assert list(ChatbotUI.coalesce_stream(iter(chunks), interval=0)) == chunks
+    assert list(ChatbotUI.coalesce_stream(iter([]))) == []
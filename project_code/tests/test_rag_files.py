@@ -0,0 +1,54 @@
+"""Tests for upload deduplication, content digests and cache pruning."""
+
+import os
+
+import pytest
+
+pytest.importorskip("langchain_openai")
+
+from langchain_helpers import RAGHelper
+
+
+def test_unique_files_drops_repeated_contents():
+    files = [("a.pdf", b"alpha"), ("copy of a.pdf", b"alpha"), ("b.pdf", b"beta")]
+    
+    unique, file_hashes = RAGHelper.unique_files(files)
+    
+    assert unique == [("a.pdf", b"alpha"), ("b.pdf", b"beta")]
+    assert len(file_hashes) == 2
+
+
+def test_content_digest_ignores_names_order_and_repeats():
+    _, hashes = RAGHelper.unique_files([("a.pdf", b"alpha"), ("b.pdf", b"beta")])
+    _, renamed = RAGHelper.unique_files([("b2.pdf", b"beta"), ("a2.pdf", b"alpha"), ("a3.pdf", b"alpha")])
+    _, changed = RAGHelper.unique_files([("a.pdf", b"alpha"), ("b.pdf", b"gamma")])
+    
+    assert RAGHelper.content_digest(hashes) == RAGHelper.content_digest(renamed)
+    assert RAGHelper.content_digest(hashes) != RAGHelper.content_digest(changed)
+
+
+def test_prune_cache_evicts_least_recently_used_entries(tmp_path):
+    def make(path, size, mtime):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+        os.utime(path, (mtime, mtime))
+    
+    make(tmp_path / "old.pdf", 100, 1_000)
+    make(tmp_path / "chunks" / "old-1500-200.pkl", 100, 2_000)
+    make(tmp_path / "faiss_openai_old" / "index.faiss", 100, 3_000)
+    os.utime(tmp_path / "faiss_openai_old", (3_000, 3_000))
+    make(tmp_path / "embeddings" / "openai-model-abc", 100, 4_000)
+    make(tmp_path / "new.pkl", 100, 5_000)
+    make(tmp_path / "upload.pdf.1-2.tmp", 1_000, 0)
+    
+    RAGHelper.prune_cache(str(tmp_path), max_bytes=250)
+    
+    # The three oldest entries go; an index directory counts as one entry
+    assert not (tmp_path / "old.pdf").exists()
+    assert not (tmp_path / "chunks" / "old-1500-200.pkl").exists()
+    assert not (tmp_path / "faiss_openai_old").exists()
+    assert (tmp_path / "embeddings" / "openai-model-abc").exists()
+    assert (tmp_path / "new.pkl").exists()
+    
+    # Writes in progress are never touched
+    assert (tmp_path / "upload.pdf.1-2.tmp").exists()
@@ -0,0 +1,29 @@
+"""Tests for the FAISS index tiers built by RAGHelper."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+pytest.importorskip("langchain_community")
+
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+
+from langchain_helpers import RAGHelper
+
+
+def test_ivfpq_index_supports_mmr_search():
+    """An IVF-PQ index can serve the MMR retriever, which reconstructs vectors."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((2000, 64)).astype("float32")
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    
+    index = RAGHelper._create_ivfpq_index(vectors)
+    store = FAISS(embedding_function=None, index=index,
+                  docstore=InMemoryDocstore(), index_to_docstore_id={})
+    store.add_embeddings([(f"chunk {i}", vector.tolist()) for i, vector in enumerate(vectors)])
+    
+    results = store.max_marginal_relevance_search_by_vector(vectors[0].tolist(), k=4, fetch_k=16)
+    
+    assert len(results) == 4
+    assert len({doc.page_content for doc in results}) == 4
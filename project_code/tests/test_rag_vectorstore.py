@@ -0,0 +1,71 @@
+"""Tests for building and reusing the RAG vector store."""
+
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_community")
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from langchain_helpers import RAGHelper
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings whose model name is not a valid file store key."""
+    
+    model: str = "BAAI/bge-small-en-v1.5"
+    embedded: int = 0
+    
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    """Route build_vectorstore to fake embeddings and one chunk per file."""
+    fake = CountingEmbeddings(size=16)
+    monkeypatch.delenv("RAG_EMBEDDINGS", raising=False)
+    monkeypatch.setattr(RAGHelper, "get_embeddings", staticmethod(lambda api_key=None, backend="openai": fake))
+    monkeypatch.setattr(RAGHelper, "load_chunks", staticmethod(
+        lambda file_name, data, folder="tmp": [Document(page_content=data.decode(), metadata={"source": file_name})]
+    ))
+    return fake
+
+
+def test_build_vectorstore_embeds_through_the_file_cache(embeddings, tmp_path):
+    """Chunk vectors are cached on disk and reused by later builds."""
+    files = [("a.pdf", b"alpha document"), ("b.pdf", b"beta document")]
+    
+    store = RAGHelper.build_vectorstore(files, folder=str(tmp_path))
+    
+    assert store.index.ntotal == 2
+    assert embeddings.embedded == 2
+    assert any((tmp_path / "embeddings").iterdir())
+    
+    # The same files load the saved index without embedding again
+    reloaded = RAGHelper.build_vectorstore(files, folder=str(tmp_path))
+    assert reloaded.index.ntotal == 2
+    assert embeddings.embedded == 2
+    
+    # A new file set only embeds the chunk that was never seen before
+    extended = RAGHelper.build_vectorstore(files + [("c.pdf", b"gamma document")], folder=str(tmp_path))
+    assert extended.index.ntotal == 3
+    assert embeddings.embedded == 3
+
+
+def test_cache_backed_embeddings_reuse_stored_vectors(tmp_path):
+    """Vectors written by one wrapper are read back by the next."""
+    fake = CountingEmbeddings(size=16)
+    texts = ["alpha", "beta"]
+    
+    first = RAGHelper.cache_backed_embeddings(fake, "local", str(tmp_path)).embed_documents(texts)
+    second = RAGHelper.cache_backed_embeddings(fake, "local", str(tmp_path)).embed_documents(texts)
+    
+    assert first == second
+    assert fake.embedded == 2
+    
+    # Keys hold only file-store-safe characters, without nested folders
+    assert all(path.is_file() for path in (tmp_path / "embeddings").iterdir())
@@ -0,0 +1,65 @@
+"""Tests for the agentic RAG workflow and its per-call settings."""
+
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("langgraph")
+pytest.importorskip("langchain_community")
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import FakeListChatModel
+
+from langchain_helpers import RAGHelper, SemanticAnswerCache
+
+
+QUESTION = "What is the total price?"
+
+
+@pytest.fixture
+def llm():
+    """Chat model that answers from a fixed list and counts its calls."""
+    return FakeListChatModel(responses=["first answer", "second answer"])
+
+
+@pytest.fixture
+def rag_app(llm):
+    """Workflow bound to a small document set and an in-memory answer cache."""
+    vector_store = FAISS.from_texts(
+        ["The total price is 42 euros.", "The invoice is dated May 3."],
+        DeterministicFakeEmbedding(size=16)
+    )
+    retriever = vector_store.as_retriever(search_type="mmr", search_kwargs={"k": 8, "fetch_k": 32})
+    return RAGHelper.build_simple_agentic_rag(llm).with_config(configurable={
+        "retriever": retriever,
+        "answer_cache": SemanticAnswerCache()
+    })
+
+
+def answer(rag_app, question, **overrides):
+    return "".join(RAGHelper.stream_answer(rag_app, question, **overrides))
+
+
+def test_cache_threshold_override_keeps_bound_settings(rag_app, llm):
+    """Overrides merge with the bound retriever and cache; hits skip the LLM."""
+    assert answer(rag_app, QUESTION, cache_threshold=0.9) == "first answer"
+    assert llm.i == 1
+    
+    # Same question: a hit at a reachable threshold
+    assert answer(rag_app, QUESTION, cache_threshold=0.9) == "first answer"
+    assert llm.i == 1
+    
+    # No cosine similarity reaches 1.5, so the override forces a miss
+    assert answer(rag_app, QUESTION, cache_threshold=1.5) == "second answer"
+    assert llm.i == 2
+
+
+def test_low_relevance_returns_fallback_without_llm(rag_app, llm):
+    """Below min_relevance the fallback is answered without a completion."""
+    # Relevance is a cosine similarity, so 1.5 can never be reached
+    assert answer(rag_app, QUESTION, min_relevance=1.5) == RAGHelper.FALLBACK_ANSWER
+    assert llm.i == 0
+    
+    # Without the override the same question reaches the LLM
+    assert answer(rag_app, QUESTION) == "first answer"
+    assert llm.i == 1
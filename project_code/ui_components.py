@@ -7,6 +7,12 @@ Provides reusable UI components and consistent styling across all pages:
 - APIKeyUI: API key configuration forms and validation
 """
 
+import base64
+import os
+import time
+from functools import lru_cache
+from typing import Iterable, Iterator
+
 import streamlit as st
 
 class ChatbotUI:
@@ -20,10 +26,148 @@ class ChatbotUI:
     USER_AVATAR = "👤"
     BOT_AVATAR = "🤖"
     
+    # Page header markup; filled per page by _page_header_html
+    PAGE_HEADER_TEMPLATE = """
+    <div style='text-align: center; margin: 0.5rem 0 1rem 0;'>
+        <h1 style='font-size: 2.625rem; margin-bottom: 1rem; text-shadow: 0 0 30px rgba(0, 212, 170, 0.5);'>
+            {icon} {title}
+        </h1>
+        <p style='font-size: 0.9rem; color: #a0a0a0; margin-top: -0.5rem;'>
+            {subtitle}
+        </p>
+    </div>
+    """
+    
+    # Dark theme CSS shared by every chatbot page, built once at import
+    ENHANCED_CSS = """
+    <style>
+        /* Enhanced chat styling */
+        .stChatMessage {
+            padding: 1rem;
+            margin: 0.5rem 0;
+            border-radius: 15px;
+            background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
+            border: 1px solid rgba(0, 212, 170, 0.1);
+            box-shadow: 0 2px 10px rgba(0, 0, 0, 0.3);
+        }
+        
+        /* Enhanced buttons */
+        .stButton > button {
+            background: linear-gradient(135deg, #00d4aa, #00a883);
+            border: none;
+            border-radius: 10px;
+            color: white;
+            font-weight: 600;
+            padding: 0.75rem 2rem;
+            transition: all 0.3s ease;
+            box-shadow: 0 4px 15px rgba(0, 212, 170, 0.3);
+        }
+        
+        .stButton > button:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 6px 20px rgba(0, 212, 170, 0.4);
+            background: linear-gradient(135deg, #00e6c0, #00cc99);
+        }
+        
+        /* Enhanced text inputs */
+        .stTextInput > div > div > input {
+            background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
+            border: 2px solid rgba(0, 212, 170, 0.2);
+            border-radius: 10px;
+            color: #ffffff;
+            font-size: 16px;
+            padding: 12px;
+            transition: all 0.3s ease;
+        }
+        
+        .stTextInput > div > div > input:focus {
+            border-color: #00d4aa;
+            box-shadow: 0 0 20px rgba(0, 212, 170, 0.3);
+        }
+        
+        /* Enhanced titles */
+        h1 {
+            background: linear-gradient(135deg, #00d4aa, #ffffff);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            font-weight: 800;
+            text-shadow: 0 0 30px rgba(0, 212, 170, 0.5);
+        }
+        
+        /* Chat input enhancement */
+        .stChatInput {
+            background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
+            border-radius: 15px;
+            border: 2px solid rgba(0, 212, 170, 0.2);
+        }
+        
+        /* Info boxes */
+        .stInfo {
+            background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
+            border-left: 4px solid #00d4aa;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0, 212, 170, 0.2);
+        }
+        
+        /* Success boxes */
+        .stSuccess {
+            background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
+            border-left: 4px solid #00d4aa;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0, 212, 170, 0.2);
+        }
+        
+        /* Error boxes */
+        .stError {
+            background: linear-gradient(135deg, #2e1e1e, #3a2a2a);
+            border-left: 4px solid #ff6b6b;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(255, 107, 107, 0.2);
+        }
+        
+        /* Warning boxes */
+        .stWarning {
+            background: linear-gradient(135deg, #2e2e1e, #3a3a2a);
+            border-left: 4px solid #ffaa00;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(255, 170, 0, 0.2);
+        }
+        
+        /* Enhanced file uploader */
+        .stFileUploader > div {
+            background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
+            border: 2px dashed rgba(0, 212, 170, 0.3);
+            border-radius: 15px;
+            padding: 2rem;
+            text-align: center;
+            transition: all 0.3s ease;
+        }
+        
+        .stFileUploader > div:hover {
+            border-color: #00d4aa;
+            box-shadow: 0 0 20px rgba(0, 212, 170, 0.2);
+        }
+        
+        /* Enhanced progress bars */
+        .stProgress > div > div {
+            background: linear-gradient(135deg, #00d4aa, #00a883);
+        }
+        
+        /* Loading spinner enhancement */
+        .stSpinner {
+            color: #00d4aa;
+        }
+    </style>
+    """
+    
     @staticmethod
+    @lru_cache(maxsize=16)
     def get_large_emoji_avatar(emoji: str, size: int = 64) -> str:
         """Create a larger emoji avatar using data URI.
         
+        The result only depends on the arguments, so each avatar is encoded
+        once per process rather than for every rendered message.
+        
         Args:
             emoji: The emoji character to display
             size: Size of the emoji in pixels
@@ -31,8 +175,6 @@ class ChatbotUI:
         Returns:
             Data URI string for the emoji image
         """
-        import base64
-        
         # Create SVG with larger emoji
         svg_content = f'''
         <svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">
@@ -56,6 +198,21 @@ class ChatbotUI:
         """Get larger bot avatar."""
         return ChatbotUI.get_large_emoji_avatar(ChatbotUI.BOT_AVATAR)
     
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def load_css(file_name: str) -> str:
+        """Read a stylesheet from the assets folder once per process.
+        
+        Args:
+            file_name: CSS file name inside assets/
+            
+        Returns:
+            The stylesheet wrapped in a <style> tag, ready for st.markdown
+        """
+        css_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", file_name)
+        with open(css_path, encoding="utf-8") as f:
+            return f"<style>\n{f.read()}</style>"
+    
     @staticmethod
     def apply_enhanced_styling() -> None:
         """Apply enhanced dark theme styling to the page.
@@ -63,126 +220,7 @@ class ChatbotUI:
         Injects custom CSS for a modern, dark-themed interface with
         gradient effects, enhanced buttons, and improved visual hierarchy.
         """
-        st.markdown("""
-        <style>
-            /* Enhanced chat styling */
-            .stChatMessage {
-                padding: 1rem;
-                margin: 0.5rem 0;
-                border-radius: 15px;
-                background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
-                border: 1px solid rgba(0, 212, 170, 0.1);
-                box-shadow: 0 2px 10px rgba(0, 0, 0, 0.3);
-            }
-            
-            /* Enhanced buttons */
-            .stButton > button {
-                background: linear-gradient(135deg, #00d4aa, #00a883);
-                border: none;
-                border-radius: 10px;
-                color: white;
-                font-weight: 600;
-                padding: 0.75rem 2rem;
-                transition: all 0.3s ease;
-                box-shadow: 0 4px 15px rgba(0, 212, 170, 0.3);
-            }
-            
-            .stButton > button:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 6px 20px rgba(0, 212, 170, 0.4);
-                background: linear-gradient(135deg, #00e6c0, #00cc99);
-            }
-            
-            /* Enhanced text inputs */
-            .stTextInput > div > div > input {
-                background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
-                border: 2px solid rgba(0, 212, 170, 0.2);
-                border-radius: 10px;
-                color: #ffffff;
-                font-size: 16px;
-                padding: 12px;
-                transition: all 0.3s ease;
-            }
-            
-            .stTextInput > div > div > input:focus {
-                border-color: #00d4aa;
-                box-shadow: 0 0 20px rgba(0, 212, 170, 0.3);
-            }
-            
-            /* Enhanced titles */
-            h1 {
-                background: linear-gradient(135deg, #00d4aa, #ffffff);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                font-weight: 800;
-                text-shadow: 0 0 30px rgba(0, 212, 170, 0.5);
-            }
-            
-            /* Chat input enhancement */
-            .stChatInput {
-                background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
-                border-radius: 15px;
-                border: 2px solid rgba(0, 212, 170, 0.2);
-            }
-            
-            /* Info boxes */
-            .stInfo {
-                background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
-                border-left: 4px solid #00d4aa;
-                border-radius: 10px;
-                box-shadow: 0 2px 10px rgba(0, 212, 170, 0.2);
-            }
-            
-            /* Success boxes */
-            .stSuccess {
-                background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
-                border-left: 4px solid #00d4aa;
-                border-radius: 10px;
-                box-shadow: 0 2px 10px rgba(0, 212, 170, 0.2);
-            }
-            
-            /* Error boxes */
-            .stError {
-                background: linear-gradient(135deg, #2e1e1e, #3a2a2a);
-                border-left: 4px solid #ff6b6b;
-                border-radius: 10px;
-                box-shadow: 0 2px 10px rgba(255, 107, 107, 0.2);
-            }
-            
-            /* Warning boxes */
-            .stWarning {
-                background: linear-gradient(135deg, #2e2e1e, #3a3a2a);
-                border-left: 4px solid #ffaa00;
-                border-radius: 10px;
-                box-shadow: 0 2px 10px rgba(255, 170, 0, 0.2);
-            }
-            
-            /* Enhanced file uploader */
-            .stFileUploader > div {
-                background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
-                border: 2px dashed rgba(0, 212, 170, 0.3);
-                border-radius: 15px;
-                padding: 2rem;
-                text-align: center;
-                transition: all 0.3s ease;
-            }
-            
-            .stFileUploader > div:hover {
-                border-color: #00d4aa;
-                box-shadow: 0 0 20px rgba(0, 212, 170, 0.2);
-            }
-            
-            /* Enhanced progress bars */
-            .stProgress > div > div {
-                background: linear-gradient(135deg, #00d4aa, #00a883);
-            }
-            
-            /* Loading spinner enhancement */
-            .stSpinner {
-                color: #00d4aa;
-            }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(ChatbotUI.ENHANCED_CSS, unsafe_allow_html=True)
     
     @staticmethod
     def setup_page(title: str, icon: str, layout: str = "wide", sidebar_state: str = "collapsed") -> None:
@@ -214,16 +252,13 @@ class ChatbotUI:
             title: Main page title
             subtitle: Descriptive subtitle text
         """
-        st.markdown(f"""
-        <div style='text-align: center; margin: 0.5rem 0 1rem 0;'>
-            <h1 style='font-size: 2.625rem; margin-bottom: 1rem; text-shadow: 0 0 30px rgba(0, 212, 170, 0.5);'>
-                {icon} {title}
-            </h1>
-            <p style='font-size: 0.9rem; color: #a0a0a0; margin-top: -0.5rem;'>
-                {subtitle}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(ChatbotUI._page_header_html(icon, title, subtitle), unsafe_allow_html=True)
+    
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _page_header_html(icon: str, title: str, subtitle: str) -> str:
+        """Fill the page header template once per distinct header."""
+        return ChatbotUI.PAGE_HEADER_TEMPLATE.format(icon=icon, title=title, subtitle=subtitle)
     
     @staticmethod
     def render_chat_message(role: str, content: str, avatar_url: str = None) -> None:
@@ -258,6 +293,36 @@ class ChatbotUI:
             with st.spinner(message):
                 yield
     
+    @staticmethod
+    def coalesce_stream(chunks: Iterable[str], interval: float = 0.05) -> Iterator[str]:
+        """Merge streamed text chunks so the page redraws at most every interval.
+        
+        st.write_stream re-sends the whole accumulated reply for every chunk
+        it receives, so forwarding single tokens ships the reply's prefix
+        hundreds of times. Buffering per interval keeps the text flowing
+        while cutting the redraws to a few per second.
+        
+        Args:
+            chunks: Text chunks as produced by the model
+            interval: Minimum seconds between yielded chunks
+            
+        Yields:
+            Concatenated text received since the previous yield
+        """
+        buffer = []
+        last_flush = time.monotonic()
+        for chunk in chunks:
+            buffer.append(chunk)
+            now = time.monotonic()
+            if now - last_flush >= interval:
+                yield "".join(buffer)
+                buffer.clear()
+                last_flush = now
+        
+        # Flush whatever arrived after the last redraw
+        if buffer:
+            yield "".join(buffer)
+    
     @staticmethod
     def display_chat_messages(messages: list) -> bool:
         """Display list of chat messages with proper avatars.
@@ -271,11 +336,13 @@ class ChatbotUI:
         if not messages:
             return False
         
+        # Resolve both avatars once instead of per message
+        avatars = {"user": ChatbotUI.get_user_avatar(), "assistant": ChatbotUI.get_bot_avatar()}
+        
         for message in messages:
-            ChatbotUI.render_chat_message(
-                message["role"], 
-                message["content"]
-            )
+            role = message["role"]
+            with st.chat_message(role, avatar=avatars.get(role, avatars["assistant"])):
+                st.markdown(message["content"])
         return True
 
 
@@ -286,6 +353,71 @@ class HomePageUI:
     hero sections, feature cards, and navigation buttons.
     """
     
+    # Feature card markup; filled per card by _feature_card_html
+    FEATURE_CARD_TEMPLATE = """
+    <div style="
+        background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
+        padding: 1rem;
+        margin: 0.5rem 0;
+        border-radius: 10px;
+        border-left: 4px solid #00d4aa;
+        box-shadow: 0 2px 10px rgba(0, 0, 0, 0.2);
+    ">
+        <strong style="color: #00d4aa;">{icon} {title}</strong> - <span style="color: #cccccc;">{description}</span>
+    </div>
+    """
+    
+    # Heading shown above the feature cards
+    FEATURE_LIST_HEADER = """
+    <div class="feature-list">
+        <h3 style="color: #00d4aa; margin-bottom: 1.5rem; text-align: center;">✨ Available Features</h3>
+    </div>
+    """
+    
+    # Landing page CSS, built once at import
+    HOME_CSS = """
+    <style>
+        /* Enhanced card styling */
+        .stButton > button {
+            background: linear-gradient(135deg, #00d4aa, #00a883);
+            border: none;
+            border-radius: 15px;
+            color: white;
+            font-weight: 600;
+            padding: 1rem 2rem;
+            transition: all 0.3s ease;
+            box-shadow: 0 4px 20px rgba(0, 212, 170, 0.3);
+            font-size: 1.1rem;
+            height: 80px;
+        }
+        
+        .stButton > button:hover {
+            transform: translateY(-3px);
+            box-shadow: 0 8px 25px rgba(0, 212, 170, 0.4);
+            background: linear-gradient(135deg, #00e6c0, #00cc99);
+        }
+        
+        /* Enhanced main title */
+        .main-title {
+            background: linear-gradient(135deg, #00d4aa, #ffffff, #00d4aa);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            font-weight: 800;
+            text-shadow: 0 0 40px rgba(0, 212, 170, 0.5);
+        }
+        
+        /* Feature list styling */
+        .feature-list {
+            background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
+            padding: 2rem;
+            border-radius: 15px;
+            border: 1px solid rgba(0, 212, 170, 0.1);
+            box-shadow: 0 4px 20px rgba(0, 0, 0, 0.3);
+            margin-top: 2rem;
+        }
+    </style>
+    """
+    
     @staticmethod
     def apply_home_styling() -> None:
         """Apply enhanced styling specific to the home page.
@@ -293,48 +425,7 @@ class HomePageUI:
         Adds custom CSS for enhanced cards, navigation buttons,
         and feature list styling optimized for the landing page.
         """
-        st.markdown("""
-        <style>
-            /* Enhanced card styling */
-            .stButton > button {
-                background: linear-gradient(135deg, #00d4aa, #00a883);
-                border: none;
-                border-radius: 15px;
-                color: white;
-                font-weight: 600;
-                padding: 1rem 2rem;
-                transition: all 0.3s ease;
-                box-shadow: 0 4px 20px rgba(0, 212, 170, 0.3);
-                font-size: 1.1rem;
-                height: 80px;
-            }
-            
-            .stButton > button:hover {
-                transform: translateY(-3px);
-                box-shadow: 0 8px 25px rgba(0, 212, 170, 0.4);
-                background: linear-gradient(135deg, #00e6c0, #00cc99);
-            }
-            
-            /* Enhanced main title */
-            .main-title {
-                background: linear-gradient(135deg, #00d4aa, #ffffff, #00d4aa);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                font-weight: 800;
-                text-shadow: 0 0 40px rgba(0, 212, 170, 0.5);
-            }
-            
-            /* Feature list styling */
-            .feature-list {
-                background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
-                padding: 2rem;
-                border-radius: 15px;
-                border: 1px solid rgba(0, 212, 170, 0.1);
-                box-shadow: 0 4px 20px rgba(0, 0, 0, 0.3);
-                margin-top: 2rem;
-            }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(HomePageUI.HOME_CSS, unsafe_allow_html=True)
     
     @staticmethod
     def render_hero_section() -> None:
@@ -363,18 +454,32 @@ class HomePageUI:
             title: Feature title text
             description: Feature description text
         """
-        st.markdown(f"""
-        <div style="
-            background: linear-gradient(135deg, #1e1e2e, #2a2a3a);
-            padding: 1rem;
-            margin: 0.5rem 0;
-            border-radius: 10px;
-            border-left: 4px solid #00d4aa;
-            box-shadow: 0 2px 10px rgba(0, 0, 0, 0.2);
-        ">
-            <strong style="color: #00d4aa;">{icon} {title}</strong> - <span style="color: #cccccc;">{description}</span>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(HomePageUI._feature_card_html(icon, title, description), unsafe_allow_html=True)
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _feature_card_html(icon: str, title: str, description: str) -> str:
+        """Fill the feature card template once per distinct card."""
+        return HomePageUI.FEATURE_CARD_TEMPLATE.format(icon=icon, title=title, description=description)
+
+    @staticmethod
+    def render_feature_list(features: tuple) -> None:
+        """Render the feature list header and all feature cards in one element.
+        
+        Args:
+            features: Tuple of (icon, title, description) tuples
+        """
+        st.markdown(HomePageUI._feature_list_html(features), unsafe_allow_html=True)
+    
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _feature_list_html(features: tuple) -> str:
+        """Join the feature list header and card markup once per feature set."""
+        cards = "".join(
+            HomePageUI._feature_card_html(icon, title, description)
+            for icon, title, description in features
+        )
+        return HomePageUI.FEATURE_LIST_HEADER + cards
 
 
 class APIKeyUI: